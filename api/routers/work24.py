@@ -1,7 +1,15 @@
 import os
+import re
+import json
 import time
+import random
+import sqlite3
 import asyncio
-from typing import Any, Dict, List, Optional, Tuple
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 from fastapi import APIRouter, Query
@@ -12,27 +20,322 @@ try:
 except Exception:
     xmltodict = None
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 WORK24_KEY = os.getenv("WORK24_KEY") or os.getenv("WORKNET_KEY") or ""
 LIST_URL   = "https://www.work24.go.kr/cm/openApi/call/wk/callOpenApiSvcInfo210L21.do"
 DETAIL_URL = "https://www.work24.go.kr/cm/openApi/call/wk/callOpenApiSvcInfo210D21.do"
 
-# ----------------- 간단 캐시 (empSeqno -> (ts, workRegionNm)) -----------------
-_REGION_CACHE: Dict[str, Tuple[float, str]] = {}
-REGION_TTL_SEC = 24 * 3600
+# 공용 클라이언트 설정: 연결 수 / 초당 요청 수(토큰 버킷) / 순간 최대 요청 수 / 재시도
+WORK24_MAX_CONNECTIONS = int(os.getenv("WORK24_MAX_CONNECTIONS", "10"))
+WORK24_RPS = float(os.getenv("WORK24_RPS", "10"))
+WORK24_BURST = int(os.getenv("WORK24_BURST", "10"))
+WORK24_RETRIES = int(os.getenv("WORK24_RETRIES", "2"))
+WORK24_BACKOFF = float(os.getenv("WORK24_BACKOFF", "0.3"))
+# HTTP/2 사용 (h2 패키지 필요: pip install httpx[http2])
+WORK24_HTTP2 = os.getenv("WORK24_HTTP2", "0") == "1"
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# ----------------- 공용 클라이언트 (app.py lifespan 에서 start/close) -----------------
+class TokenBucket:
+    """초당 rate 개씩 토큰이 차고 최대 burst 개까지 쌓이는 버킷. 토큰이 없으면 찰 때까지 대기"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Work24Client:
+    """
+    work24.go.kr 호출용 keep-alive 클라이언트 하나를 공유.
+    - 토큰 버킷으로 업스트림 호출량 제한 (재시도 포함)
+    - 5xx/429/타임아웃/연결 오류는 지수 백오프 후 재시도 (모두 GET)
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._bucket = TokenBucket(WORK24_RPS, WORK24_BURST)
+
+    async def start(self):
+        if self._client is not None:
+            return
+        http2 = WORK24_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("h2 패키지가 없어 HTTP/1.1 로 연결합니다. (pip install httpx[http2])")
+                http2 = False
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(25.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=WORK24_MAX_CONNECTIONS,
+                max_keepalive_connections=WORK24_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, params: Dict[str, Any], timeout: float = 25) -> httpx.Response:
+        if self._client is None:
+            # lifespan 밖에서 호출된 경우 지연 생성
+            await self.start()
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            try:
+                r = await self._client.get(url, params=params, timeout=timeout)
+                if r.status_code not in RETRY_STATUS or attempt >= WORK24_RETRIES:
+                    return r
+                logger.warning(f"Work24 {r.status_code}, 재시도 {attempt + 1}/{WORK24_RETRIES}")
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                if attempt >= WORK24_RETRIES:
+                    raise
+                logger.warning(f"Work24 {e.__class__.__name__}, 재시도 {attempt + 1}/{WORK24_RETRIES}")
+            await asyncio.sleep(WORK24_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+            attempt += 1
+
+    async def iter_bytes(self, url: str, params: Dict[str, Any], timeout: float = 25) -> AsyncIterator[bytes]:
+        """응답 본문을 받는 대로 조각 단위로 전달 (본문을 받기 시작한 뒤에는 재시도하지 않음)"""
+        if self._client is None:
+            await self.start()
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            started = False
+            try:
+                async with self._client.stream("GET", url, params=params, timeout=timeout) as r:
+                    if r.status_code not in RETRY_STATUS or attempt >= WORK24_RETRIES:
+                        r.raise_for_status()
+                        async for chunk in r.aiter_bytes():
+                            started = True
+                            yield chunk
+                        return
+                    logger.warning(f"Work24 {r.status_code}, 재시도 {attempt + 1}/{WORK24_RETRIES}")
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                if started or attempt >= WORK24_RETRIES:
+                    raise
+                logger.warning(f"Work24 {e.__class__.__name__}, 재시도 {attempt + 1}/{WORK24_RETRIES}")
+            await asyncio.sleep(WORK24_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+            attempt += 1
+
+
+work24 = Work24Client()
+
+# ----------------- 캐시 (TTL + stale-while-revalidate) -----------------
+# 목록: (startPage, display, keyword) → 근무지까지 합성된 items
+# 상세: empSeqno → 필요한 필드만 뽑은 상세(dict) + 근무지/자소서 문항
+WORK24_LIST_TTL = float(os.getenv("WORK24_LIST_TTL", "300"))
+WORK24_LIST_STALE = float(os.getenv("WORK24_LIST_STALE", "3600"))   # TTL 이후 이 시간까지는 옛 값 응답 + 백그라운드 갱신
+WORK24_DETAIL_TTL = float(os.getenv("WORK24_DETAIL_TTL", str(24 * 3600)))
+WORK24_DETAIL_STALE = float(os.getenv("WORK24_DETAIL_STALE", str(24 * 3600)))
+# 메모리 캐시 최대 항목 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+WORK24_LIST_MAX = int(os.getenv("WORK24_LIST_MAX", "200"))
+WORK24_DETAIL_MAX = int(os.getenv("WORK24_DETAIL_MAX", "5000"))
+# 디스크 캐시(SQLite) 경로. 지정하면 워커 간 공유 + 재시작 후에도 유지 (비우면 메모리만)
+WORK24_CACHE_DB = os.getenv("WORK24_CACHE_DB", "")
+CACHE_SWEEP_SEC = 60
+# 백그라운드로 미리 채워 둘 목록 페이지 수 (0이면 끔)
+WORK24_WARM_PAGES = int(os.getenv("WORK24_WARM_PAGES", "3"))
+WORK24_WARM_DISPLAY = 20
+# 지역 필터: 한 번에 가져올 업스트림 페이지 크기 / 최대 업스트림 페이지 수
+WORK24_FILTER_PAGE_SIZE = WORK24_WARM_DISPLAY  # 미리 갱신되는 페이지와 같은 크기 → 앞쪽은 캐시에서 응답
+WORK24_FILTER_MAX_PAGES = int(os.getenv("WORK24_FILTER_MAX_PAGES", "10"))
+
+class DiskCache:
+    """SQLite(WAL) 2차 캐시: (ns, key) → (ts, JSON). 여러 uvicorn 워커가 같은 파일을 공유"""
+
+    def __init__(self, path: str):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, ts REAL NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (ns, key))"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, ns: str, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT ts, value FROM cache WHERE ns = ? AND key = ?", (ns, key)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def set(self, ns: str, key: str, ts: float, value: Any):
+        body = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO cache (ns, key, ts, value) VALUES (?, ?, ?, ?)", (ns, key, ts, body))
+
+    def purge(self, ns: str, before: float):
+        with self._lock:
+            self._db.execute("DELETE FROM cache WHERE ns = ? AND ts < ?", (ns, before))
+
+class SwrCache:
+    """
+    TTL 이내 → 캐시 값, TTL~TTL+stale → 캐시 값을 바로 주고 백그라운드로 갱신, 그 이후 → 새로 로딩
+    갱신이 실패하면 옛 값을 계속 사용 (stale 기간 안에서)
+    같은 키의 로딩은 동시에 하나만 실행 (single-flight): 나머지 요청은 진행 중인 로딩 결과를 함께 기다림
+    - 메모리: 최대 max_entries 개, LRU 제거 + 주기적으로 만료 항목 정리
+    - disk 가 있으면 메모리 미스 시 디스크 확인, 로딩 결과는 디스크에도 기록
+    """
 
-def _cache_get(emp_seq: str) -> Optional[str]:
-    rec = _REGION_CACHE.get(emp_seq)
-    if not rec:
+    def __init__(self, name: str, ttl: float, stale: float = 0.0, max_entries: int = 1000,
+                 disk: Optional[DiskCache] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self.disk = disk
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Any, asyncio.Future] = {}
+        self._last_sweep = time.time()
+        self.hits = 0        # 캐시 값으로 응답 (stale 포함)
+        self.misses = 0      # 캐시에 없어서 로딩
+        self.disk_hits = 0   # 메모리에 없고 디스크에서 찾음
+        self.evictions = 0
+        self.loads = 0       # 실제 업스트림 로딩 수
+        self.coalesced = 0   # 진행 중인 로딩에 합류한 요청 수
+
+    def _disk_key(self, key) -> str:
+        return json.dumps(key, ensure_ascii=False)
+
+    def _put(self, key, ts: float, value):
+        self._data[key] = (ts, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key, loader: Callable[[], Awaitable[Any]]) -> Any:
+        rec = self._data.get(key)
+        if rec is not None:
+            self._data.move_to_end(key)
+        elif self.disk is not None:
+            rec = await asyncio.to_thread(self.disk.get, self.name, self._disk_key(key))
+            if rec is not None:
+                self.disk_hits += 1
+                self._put(key, *rec)
+        if rec:
+            age = time.time() - rec[0]
+            if age <= self.ttl:
+                self.hits += 1
+                return rec[1]
+            if age <= self.ttl + self.stale:
+                self.hits += 1
+                self._schedule_refresh(key, loader)
+                return rec[1]
+        self.misses += 1
+        return await self.refresh(key, loader)
+
+    async def warm(self, key, loader: Callable[[], Awaitable[Any]], max_age: float):
+        """max_age 보다 오래된 경우에만 갱신 (재시작 직후 디스크에 새 값이 있으면 업스트림 호출 생략)"""
+        rec = self._data.get(key)
+        if rec is None and self.disk is not None:
+            rec = await asyncio.to_thread(self.disk.get, self.name, self._disk_key(key))
+            if rec is not None:
+                self.disk_hits += 1
+                self._put(key, *rec)
+        if rec is None or time.time() - rec[0] > max_age:
+            await self.refresh(key, loader)
+
+    async def refresh(self, key, loader: Callable[[], Awaitable[Any]]) -> Any:
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f, k=key: self._done(k, f))
+        else:
+            self.coalesced += 1
+        # 기다리던 요청 하나가 취소돼도 공유 로딩은 계속
+        return await asyncio.shield(fut)
+
+    async def _load(self, key, loader):
+        self.loads += 1
+        value = await loader()
+        ts = time.time()
+        self._put(key, ts, value)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, self.name, self._disk_key(key), ts, value)
+            except Exception as e:
+                logger.warning(f"Work24 디스크 캐시 기록 실패: {e}")
+        if ts - self._last_sweep > CACHE_SWEEP_SEC:
+            self.purge()
+        return value
+
+    def _done(self, key, fut: asyncio.Future):
+        self._inflight.pop(key, None)
+        # 기다리는 쪽이 모두 취소된 경우에도 예외가 "retrieved" 되도록
+        if not fut.cancelled():
+            fut.exception()
+
+    def _schedule_refresh(self, key, loader):
+        if key in self._inflight:
+            return
+
+        async def run():
+            try:
+                await self.refresh(key, loader)
+            except Exception as e:
+                logger.warning(f"Work24 캐시 갱신 실패 {key}: {e}")
+
+        asyncio.create_task(run())
+
+    def purge(self):
+        # stale 기간까지 지난 항목 제거 (메모리는 여기서, 디스크는 백그라운드 스레드)
+        self._last_sweep = time.time()
+        limit = self._last_sweep - self.ttl - self.stale
+        for key in [k for k, (ts, _) in self._data.items() if ts < limit]:
+            self._data.pop(key, None)
+        if self.disk is not None:
+            asyncio.get_running_loop().run_in_executor(None, self.disk.purge, self.name, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"size": len(self._data), "max": self.max_entries, "inflight": len(self._inflight),
+                "hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "disk_hits": self.disk_hits, "evictions": self.evictions,
+                "loads": self.loads, "coalesced": self.coalesced}
+
+def _open_disk_cache() -> Optional[DiskCache]:
+    if not WORK24_CACHE_DB:
         return None
-    ts, val = rec
-    if time.time() - ts > REGION_TTL_SEC:
+    try:
+        return DiskCache(WORK24_CACHE_DB)
+    except Exception as e:
+        logger.warning(f"Work24 디스크 캐시를 열 수 없어 메모리 캐시만 사용합니다: {e}")
         return None
-    return val
 
-def _cache_set(emp_seq: str, val: str):
-    _REGION_CACHE[emp_seq] = (time.time(), val or "")
+_DISK_CACHE = _open_disk_cache()
+_LIST_CACHE = SwrCache("list:v2", WORK24_LIST_TTL, WORK24_LIST_STALE, WORK24_LIST_MAX, _DISK_CACHE)
+_DETAIL_CACHE = SwrCache("detail:v2", WORK24_DETAIL_TTL, WORK24_DETAIL_STALE, WORK24_DETAIL_MAX, _DISK_CACHE)
 
 # ----------------- 공통 유틸 -----------------
 def _xml_to_dict(text: str) -> Dict[str, Any]:
@@ -71,8 +374,51 @@ def _simplify_list_item(it: Dict[str, Any]) -> Dict[str, Any]:
         # workRegionNm은 아래 enrich 단계에서 채움
     }
 
+# ----------------- 스트리밍 XML 파싱 -----------------
+# 응답 전체 문자열/중첩 dict 를 만들지 않고, 받는 조각마다 파서에 넣어 필요한 요소만 꺼낸 뒤 바로 비움
+LIST_ITEM_TAG = "dhsOpenEmpInfo"
+# 상세에서 목록으로 모으는 요소: 컨테이너 → 항목 태그 (프론트에서 쓰는 것만)
+DETAIL_LISTS = {
+    "empRecrList": "empRecrListInfo",    # 모집분야 (근무지 포함)
+    "empSelsList": "empSelsListInfo",    # 전형/자소서 문항
+    "empJobsList": "empJobsListInfo",    # 직무
+}
+DETAIL_ROW_TAGS = set(DETAIL_LISTS.values())
+
+def _text(el) -> Optional[str]:
+    # xmltodict 와 같게: 앞뒤 공백 제거, 빈 값은 None
+    return (el.text or "").strip() or None
+
+def _leaf_dict(el) -> Dict[str, Any]:
+    # 자식 요소 → {태그: 텍스트}. 같은 태그가 반복되면 리스트
+    out: Dict[str, Any] = {}
+    for c in el:
+        v = _text(c)
+        if c.tag in out:
+            prev = out[c.tag]
+            out[c.tag] = prev + [v] if isinstance(prev, list) else [prev, v]
+        else:
+            out[c.tag] = v
+    return out
+
+async def _iter_xml(chunks: AsyncIterator[bytes], events=("end",)):
+    parser = ET.XMLPullParser(events=events)
+    try:
+        async for chunk in chunks:
+            parser.feed(chunk)
+            for ev in parser.read_events():
+                yield ev
+        parser.close()
+        for ev in parser.read_events():
+            yield ev
+    except ET.ParseError as e:
+        # 잘린/깨진 응답은 실패로 처리 → 일부만 담긴 결과가 캐시/색인되지 않음 (캐시는 이전 값 유지)
+        logger.warning(f"Work24 XML 파싱 오류: {e}")
+        raise
+
 # ----------------- 목록 -----------------
-async def _fetch_list(client: httpx.AsyncClient, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def _iter_list(params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """목록 항목을 응답이 도착하는 대로 하나씩 반환"""
     q = {
         "authKey": WORK24_KEY,
         "callTp": "L",
@@ -83,12 +429,10 @@ async def _fetch_list(client: httpx.AsyncClient, params: Dict[str, Any]) -> List
     if params.get("keyword"):
         q["empWantedTitle"] = params["keyword"]
 
-    r = await client.get(LIST_URL, params=q, timeout=20)
-    r.raise_for_status()
-    data = _xml_to_dict(r.text) or {}
-    items = _get_first(data, "dhsOpenEmpInfoList", "dhsOpenEmpInfo")
-    items = _ensure_list(items)
-    return [_simplify_list_item(it) for it in items]
+    async for _, el in _iter_xml(work24.iter_bytes(LIST_URL, params=q, timeout=20)):
+        if el.tag == LIST_ITEM_TAG:
+            yield _simplify_list_item(_leaf_dict(el))
+            el.clear()
 
 # ----------------- 상세 파싱 -----------------
 def _parse_work_regions(detail_root: Dict[str, Any]) -> str:
@@ -125,37 +469,418 @@ def _parse_selfintro_questions(detail_root: Dict[str, Any]) -> List[str]:
                     out.append(s)
     return out
 
-# ----------------- 상세: 근무지만 빠르게 캐싱 -----------------
-async def _fetch_detail_for_region(client: httpx.AsyncClient, emp_seq: str) -> str:
-    hit = _cache_get(emp_seq)
-    if hit is not None:
-        return hit
+# ----------------- 상세 (캐시 공유: 목록 근무지 합성 + 단일 상세) -----------------
+async def _parse_detail_stream(chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+    """
+    상세 XML → 루트 바로 아래 값 필드 + DETAIL_LISTS 목록만 담은 dict
+    (xmltodict 결과의 dhsOpenEmpInfoDetailRoot 와 같은 모양, 목록은 항상 리스트)
+    """
+    detail: Dict[str, Any] = {}
+    path: List[str] = []
+    async for ev, el in _iter_xml(chunks, events=("start", "end")):
+        if ev == "start":
+            path.append(el.tag)
+            continue
+        depth = len(path)
+        if el.tag in DETAIL_ROW_TAGS:
+            row = _leaf_dict(el)
+            parent = path[-2] if depth >= 2 else ""
+            if DETAIL_LISTS.get(parent) == el.tag:
+                detail.setdefault(parent, {}).setdefault(el.tag, []).append(row)
+            else:
+                detail.setdefault(el.tag, []).append(row)
+            el.clear()
+        elif depth == 2 and len(el) == 0:
+            detail[el.tag] = _text(el)
+        path.pop()
+    return detail
+
+async def _load_detail(emp_seq: str) -> Dict[str, Any]:
+    q = {"authKey": WORK24_KEY, "returnType": "XML", "callTp": "D", "empSeqno": emp_seq}
+    detail = await _parse_detail_stream(work24.iter_bytes(DETAIL_URL, params=q, timeout=25))
+    return {
+        "detail": detail,
+        "workRegionNm": _parse_work_regions(detail),
+        "selfintroQstList": _parse_selfintro_questions(detail),
+    }
+
+async def _get_detail(emp_seq: str) -> Dict[str, Any]:
+    return await _DETAIL_CACHE.get(emp_seq, lambda: _load_detail(emp_seq))
 
+async def _load_detail_raw(emp_seq: str) -> Dict[str, Any]:
+    # raw=true 일 때만: 원본 전체 트리 (캐시하지 않음)
     q = {"authKey": WORK24_KEY, "returnType": "XML", "callTp": "D", "empSeqno": emp_seq}
-    r = await client.get(DETAIL_URL, params=q, timeout=25)
-    if r.status_code != 200:
-        _cache_set(emp_seq, "")
+    r = await work24.get(DETAIL_URL, params=q, timeout=25)
+    r.raise_for_status()
+    return _xml_to_dict(r.text) or {}
+
+async def _fetch_detail_for_region(emp_seq: str) -> str:
+    try:
+        return (await _get_detail(emp_seq))["workRegionNm"]
+    except Exception:
         return ""
-    data = _xml_to_dict(r.text) or {}
-    root = _get_first(data, "dhsOpenEmpInfoDetailRoot") or {}
-    val = _parse_work_regions(root)
-    _cache_set(emp_seq, val)
-    return val
-
-async def _enrich_regions(items: List[Dict[str, Any]], concurrency: int = 6):
-    sem = asyncio.Semaphore(concurrency)
-    async with httpx.AsyncClient() as client:
-        async def worker(job: Dict[str, Any]):
-            emp_seq = job.get("empSeqno")
-            if not emp_seq:
-                return
-            async with sem:
+
+async def _enrich_one(job: Dict[str, Any], sem: asyncio.Semaphore):
+    emp_seq = job.get("empSeqno")
+    if not emp_seq:
+        return
+    async with sem:
+        try:
+            job["workRegionNm"] = await _fetch_detail_for_region(emp_seq)
+        except Exception:
+            job["workRegionNm"] = ""
+
+# ----------------- 지역 정규화 / 인덱스 -----------------
+# 시/도 정식 명칭 → 약칭. 정규식은 시작 시 한 번만 만듦
+REGION_ALIASES = {
+    "서울특별시": "서울", "경기도": "경기", "경상남도": "경남", "경상북도": "경북",
+    "충청남도": "충남", "충청북도": "충북", "전라남도": "전남", "전라북도": "전북",
+    "전북특별자치도": "전북", "강원특별자치도": "강원", "강원도": "강원", "제주특별자치도": "제주",
+    "부산광역시": "부산", "대구광역시": "대구", "인천광역시": "인천", "광주광역시": "광주",
+    "대전광역시": "대전", "울산광역시": "울산", "세종특별자치시": "세종",
+}
+_REGION_RE = re.compile("|".join(map(re.escape, sorted(REGION_ALIASES, key=len, reverse=True))))
+_REGION_SHORT = set(REGION_ALIASES.values())
+
+def normalize_region(s: str) -> str:
+    """정식 명칭을 모두 약칭으로 바꾼 문자열 (예: "서울특별시 강남구" → "서울 강남구")"""
+    return _REGION_RE.sub(lambda m: REGION_ALIASES[m.group(0)], s or "")
+
+def region_keys(work_region: str) -> List[str]:
+    """근무지 문자열("서울 강남구·경기 성남시") → 시/도 약칭 목록 ["서울", "경기"]"""
+    keys: List[str] = []
+    for part in normalize_region(work_region).split("·"):
+        head = part.strip().split(" ", 1)[0]
+        if head in _REGION_SHORT and head not in keys:
+            keys.append(head)
+    return keys
+
+def _index_page(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # 목록 페이지 캐시 값: 항목 + 정규화된 근무지 + 시/도 → 항목 위치
+    norms = [normalize_region(it.get("workRegionNm") or "") for it in items]
+    regions: Dict[str, List[int]] = {}
+    for i, it in enumerate(items):
+        for key in region_keys(it.get("workRegionNm") or ""):
+            regions.setdefault(key, []).append(i)
+    return {"items": items, "norms": norms, "regions": regions}
+
+def _match_positions(page: Dict[str, Any], want: str) -> List[int]:
+    if want in _REGION_SHORT:
+        return page["regions"].get(want, [])
+    # 시/도가 아닌 검색어(예: "강남구")는 정규화된 근무지 문자열에서 부분 일치
+    return [i for i, n in enumerate(page["norms"]) if n and want in n]
+
+# ----------------- 목록 캐시 / 백그라운드 갱신 -----------------
+async def _load_jobs(start_page: int, display: int, keyword: Optional[str]) -> List[Dict[str, Any]]:
+    # 목록 항목이 도착하는 대로 근무지 합성(상세 조회)을 시작 → 목록 파싱과 상세 조회가 겹침
+    items: List[Dict[str, Any]] = []
+    sem = asyncio.Semaphore(6)
+    tasks = []
+    async for job in _iter_list({"startPage": start_page, "display": display, "keyword": keyword}):
+        items.append(job)
+        tasks.append(asyncio.ensure_future(_enrich_one(job, sem)))
+    await asyncio.gather(*tasks)
+    return _index_page(items)
+
+async def _get_page(start_page: int, display: int, keyword: Optional[str]) -> Dict[str, Any]:
+    key = (start_page, display, keyword or None)
+    return await _LIST_CACHE.get(key, lambda: _load_jobs(start_page, display, keyword))
+
+async def list_jobs(start_page: int = 1, display: int = 20, keyword: Optional[str] = None) -> List[Dict[str, Any]]:
+    return (await _get_page(start_page, display, keyword))["items"]
+
+async def list_jobs_in_region(region: str, start_page: int = 1, display: int = 20,
+                              keyword: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    지역 필터 결과를 display 개씩 페이지로 나눠 반환 (startPage = 필터된 결과의 페이지)
+    업스트림 페이지를 차례로 (캐시에서) 가져와 필요한 개수가 찰 때까지 이어 붙임
+    반환: (항목, 다음 페이지 존재 여부)
+    """
+    want = normalize_region(region.strip())
+    need = start_page * display
+    matches: List[Dict[str, Any]] = []
+    has_more = False
+    for upstream_page in range(1, WORK24_FILTER_MAX_PAGES + 1):
+        page = await _get_page(upstream_page, WORK24_FILTER_PAGE_SIZE, keyword)
+        matches.extend(page["items"][i] for i in _match_positions(page, want))
+        if len(matches) > need:
+            has_more = True
+            break
+        if len(page["items"]) < WORK24_FILTER_PAGE_SIZE:
+            break  # 업스트림 마지막 페이지
+    return matches[(start_page - 1) * display:need], has_more
+
+_warm_task: Optional[asyncio.Task] = None
+
+async def _warm_loop():
+    # 첫 몇 페이지는 TTL 이 끝나기 전에 미리 갱신 → 목록 페이지가 항상 메모리에서 응답
+    interval = max(30.0, WORK24_LIST_TTL * 0.8)
+    while True:
+        for page in range(1, WORK24_WARM_PAGES + 1):
+            key = (page, WORK24_WARM_DISPLAY, None)
+            try:
+                await _LIST_CACHE.warm(key, lambda p=page: _load_jobs(p, WORK24_WARM_DISPLAY, None), interval)
+            except Exception as e:
+                logger.warning(f"Work24 목록 미리 갱신 실패 (page={page}): {e}")
+        # 요청이 없는 동안에도 만료 항목 정리
+        _LIST_CACHE.purge()
+        _DETAIL_CACHE.purge()
+        await asyncio.sleep(interval)
+
+# ----------------- 로컬 검색 인덱스 (SQLite FTS5) -----------------
+# 백그라운드로 업스트림 목록(+상세 캐시)을 훑어 제목/회사/근무지/고용형태/자소서 문항을 색인
+# 검색은 로컬 인덱스에서 처리 → 업스트림이 느려도 검색은 바로 응답
+WORK24_SEARCH_DB = os.getenv("WORK24_SEARCH_DB", os.path.join("data", "work24_search.db"))
+WORK24_SEARCH_SYNC_PAGES = int(os.getenv("WORK24_SEARCH_SYNC_PAGES", "25"))
+WORK24_SEARCH_SYNC_SEC = float(os.getenv("WORK24_SEARCH_SYNC_SEC", "1800"))
+# 색인 결과가 모자란 검색어의 백그라운드 보충 - 업스트림 페이지 수(0=끔) / 같은 검색어 재보충 간격(초) / 동시 보충 수
+WORK24_SEARCH_REFILL_PAGES = int(os.getenv("WORK24_SEARCH_REFILL_PAGES", "2"))
+WORK24_SEARCH_REFILL_COOLDOWN = float(os.getenv("WORK24_SEARCH_REFILL_COOLDOWN", "600"))
+WORK24_SEARCH_REFILL_MAX = int(os.getenv("WORK24_SEARCH_REFILL_MAX", "4"))
+# 이 횟수만큼 연속으로 동기화에서 안 보인 공고는 삭제 (끝까지 못 훑은 경우에도 오래된 공고 정리)
+WORK24_SEARCH_KEEP_SYNCS = int(os.getenv("WORK24_SEARCH_KEEP_SYNCS", "3"))
+# 컬럼별 가중치 (bm25): 제목 > 회사 > 근무지 = 고용형태 > 자소서 문항
+SEARCH_WEIGHTS = (5.0, 3.0, 1.0, 1.0, 0.5)
+SEARCH_COLUMNS = ("title", "company", "region", "emp_type", "questions")
+_FTS_TOKEN_RE = re.compile(r"[\w가-힣]+")
+# 스키마가 바뀌면 올림 → 기존 색인을 지우고 다시 만듦 (다음 동기화 때 채워짐)
+_SEARCH_SCHEMA_VERSION = 2
+
+def _date_key(value: Any) -> str:
+    # 마감일을 YYYYMMDD 로 (형식을 모르면 빈 문자열 → 마감일 기준 정리 대상 아님)
+    digits = re.sub(r"\D", "", str(value or ""))[:8]
+    return digits if len(digits) == 8 else ""
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class JobSearchIndex:
+    def __init__(self, path: str = WORK24_SEARCH_DB):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.synced_at: Optional[float] = None
+        self.available = True
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        if self._db is not None or not self.available:
+            return self._db
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] < _SEARCH_SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS jobs_fts")
+                db.execute("DROP TABLE IF EXISTS jobs")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY, empSeqno TEXT UNIQUE NOT NULL,"
+                " item TEXT NOT NULL, end_date TEXT NOT NULL DEFAULT '', synced_at REAL NOT NULL)"
+            )
+            # trigram: 부분 문자열 검색 (복합어 '백엔드개발자' 안의 '개발자'도 찾음, SQLite 3.34+)
+            db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+                " title, company, region, emp_type, questions, tokenize='trigram')"
+            )
+            db.execute(f"PRAGMA user_version = {_SEARCH_SCHEMA_VERSION}")
+            row = db.execute("SELECT MAX(synced_at) FROM jobs").fetchone()
+            self.synced_at = row[0] if row else None
+            self._db = db
+        except sqlite3.OperationalError as e:
+            # FTS5/trigram 없는 SQLite 빌드 등 → 검색은 업스트림 키워드 조회로 대체
+            logger.warning(f"Work24 검색 인덱스를 사용할 수 없습니다: {e}")
+            self.available = False
+        return self._db
+
+    def upsert(self, rows: List[Tuple[Dict[str, Any], List[str]]], synced_at: float):
+        db = self._open()
+        if db is None:
+            return
+        with self._lock:
+            db.execute("BEGIN")
+            try:
+                for item, questions in rows:
+                    emp_seq = item.get("empSeqno")
+                    if not emp_seq:
+                        continue
+                    body = json.dumps(item, ensure_ascii=False)
+                    end_date = _date_key(item.get("endDate"))
+                    old = db.execute("SELECT id FROM jobs WHERE empSeqno = ?", (emp_seq,)).fetchone()
+                    if old:
+                        db.execute("DELETE FROM jobs_fts WHERE rowid = ?", (old[0],))
+                        db.execute("UPDATE jobs SET item = ?, end_date = ?, synced_at = ? WHERE id = ?",
+                                   (body, end_date, synced_at, old[0]))
+                        rowid = old[0]
+                    else:
+                        rowid = db.execute("INSERT INTO jobs (empSeqno, item, end_date, synced_at) VALUES (?, ?, ?, ?)",
+                                           (emp_seq, body, end_date, synced_at)).lastrowid
+                    db.execute(
+                        "INSERT INTO jobs_fts (rowid, title, company, region, emp_type, questions) VALUES (?, ?, ?, ?, ?, ?)",
+                        (rowid, item.get("title") or "", item.get("company") or "",
+                         normalize_region(item.get("workRegionNm") or ""), item.get("empWantedTypeNm") or "",
+                         "\n".join(questions)),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        self.synced_at = synced_at
+
+    def prune(self, before: float, today: str = "") -> int:
+        # before 이전 동기화에서 마지막으로 본 공고 + 마감일(YYYYMMDD)이 today 이전인 공고 제거
+        db = self._open()
+        if db is None:
+            return 0
+        where = "synced_at < ? OR (end_date != '' AND end_date < ?)"
+        with self._lock:
+            db.execute("BEGIN")
+            db.execute(f"DELETE FROM jobs_fts WHERE rowid IN (SELECT id FROM jobs WHERE {where})", (before, today))
+            removed = db.execute(f"DELETE FROM jobs WHERE {where}", (before, today)).rowcount
+            db.execute("COMMIT")
+        return removed
+
+    @staticmethod
+    def _build_query(q: str, region: Optional[str]) -> Tuple[List[str], List[Any], Optional[str]]:
+        """
+        검색어 → (WHERE 조건들, 파라미터, MATCH 식)
+        trigram 은 3글자 이상만 MATCH 가능 → '개발', '서울' 같은 2글자 이하는 LIKE 로 (색인 없이 스캔, 공고 수가 적어 충분히 빠름)
+        사용자 입력의 FTS 문법 문자는 토큰화로 제거
+        """
+        where: List[str] = []
+        args: List[Any] = []
+        match: List[str] = []
+        terms = [(None, t) for t in _FTS_TOKEN_RE.findall(q or "")]
+        if region:
+            terms += [("region", t) for t in _FTS_TOKEN_RE.findall(region)]
+        for column, term in terms:
+            if len(term) >= 3:
+                match.append(f'{column}:"{term}"' if column else f'"{term}"')
+                continue
+            columns = (column,) if column else SEARCH_COLUMNS
+            where.append("(" + " OR ".join(f"jobs_fts.{c} LIKE ? ESCAPE '\\'" for c in columns) + ")")
+            args += [f"%{_like_escape(term)}%"] * len(columns)
+        match_expr = " AND ".join(match) or None
+        if match_expr:
+            where.insert(0, "jobs_fts MATCH ?")
+            args.insert(0, match_expr)
+        return where, args, match_expr
+
+    def search(self, q: str, region: Optional[str], page: int, size: int) -> Optional[Dict[str, Any]]:
+        db = self._open()
+        if db is None or self.synced_at is None:
+            return None  # 아직 한 번도 동기화되지 않음
+        where, args, match = self._build_query(q, region)
+        if not where:
+            return {"items": [], "total": 0}
+        cond = " AND ".join(where)
+        # MATCH 가 있으면 bm25 순위, 짧은 검색어만 있으면 최근 색인 순
+        order = "bm25(jobs_fts, ?, ?, ?, ?, ?)" if match else "j.synced_at DESC, j.id"
+        order_args = list(SEARCH_WEIGHTS) if match else []
+        with self._lock:
+            total = db.execute(f"SELECT COUNT(*) FROM jobs_fts WHERE {cond}", args).fetchone()[0]
+            rows = db.execute(
+                f"SELECT j.item FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid"
+                f" WHERE {cond} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*args, *order_args, size, (page - 1) * size),
+            ).fetchall()
+        return {"items": [json.loads(r[0]) for r in rows], "total": total}
+
+    def count(self) -> int:
+        db = self._open()
+        if db is None:
+            return 0
+        with self._lock:
+            return db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+job_index = JobSearchIndex()
+
+async def sync_search_index(keyword: Optional[str] = None, pages: int = WORK24_SEARCH_SYNC_PAGES):
+    """
+    업스트림 목록을 pages 페이지까지 훑어 색인 (목록/상세는 캐시 경유)
+    keyword 가 있으면 그 제목 검색 결과만 추가 색인 (전체 목록이 아니므로 정리는 하지 않음)
+    """
+    started = time.time()
+    complete = False
+    for page_no in range(1, pages + 1):
+        page = await _get_page(page_no, WORK24_FILTER_PAGE_SIZE, keyword)
+        rows = []
+        for item in page["items"]:
+            emp_seq = item.get("empSeqno")
+            questions: List[str] = []
+            if emp_seq:
                 try:
-                    job["workRegionNm"] = await _fetch_detail_for_region(client, emp_seq)
+                    questions = (await _get_detail(emp_seq))["selfintroQstList"]
                 except Exception:
-                    job["workRegionNm"] = ""
-
-        await asyncio.gather(*(worker(it) for it in items))
+                    pass
+            rows.append((item, questions))
+        await asyncio.to_thread(job_index.upsert, rows, time.time())
+        if len(page["items"]) < WORK24_FILTER_PAGE_SIZE:
+            complete = True
+            break
+    if keyword:
+        logger.info(f"Work24 검색 인덱스 보충 완료 ({keyword!r}, {time.time() - started:.1f}s)")
+        return
+    # 끝까지 훑었으면 이번에 안 보인 공고 정리, 일부 페이지만 봤으면 여러 번 연속으로 안 보인 공고만 정리
+    # 마감일이 지난 공고는 항상 정리
+    before = started if complete else started - WORK24_SEARCH_KEEP_SYNCS * WORK24_SEARCH_SYNC_SEC
+    removed = await asyncio.to_thread(job_index.prune, before, time.strftime("%Y%m%d"))
+    if removed:
+        logger.info(f"Work24 검색 인덱스에서 오래된 공고 {removed}건 삭제")
+    logger.info(f"Work24 검색 인덱스 동기화 완료 ({time.time() - started:.1f}s)")
+
+_sync_task: Optional[asyncio.Task] = None
+# 검색어별 보충 작업 / 마지막 보충 시각 (같은 검색어는 쿨다운 동안 다시 보충하지 않음)
+_refill_tasks: Dict[str, asyncio.Task] = {}
+_refilled_at: Dict[str, float] = {}
+
+def schedule_search_refill(keyword: str) -> bool:
+    """색인 결과가 모자란 검색어 → 업스트림 제목 검색 결과를 백그라운드로 색인 (응답은 기다리지 않음)"""
+    keyword = keyword.strip()
+    now = time.time()
+    if (not keyword or not WORK24_KEY or WORK24_SEARCH_REFILL_PAGES <= 0 or keyword in _refill_tasks
+            or now - _refilled_at.get(keyword, 0.0) < WORK24_SEARCH_REFILL_COOLDOWN
+            or len(_refill_tasks) >= WORK24_SEARCH_REFILL_MAX):
+        return False
+    for k in [k for k, t in _refilled_at.items() if now - t >= WORK24_SEARCH_REFILL_COOLDOWN]:
+        _refilled_at.pop(k, None)
+    _refilled_at[keyword] = now
+
+    async def refill():
+        try:
+            await sync_search_index(keyword, WORK24_SEARCH_REFILL_PAGES)
+        except Exception as e:
+            logger.warning(f"Work24 검색 인덱스 보충 실패 ({keyword!r}): {e}")
+        finally:
+            _refill_tasks.pop(keyword, None)
+
+    _refill_tasks[keyword] = asyncio.create_task(refill())
+    return True
+
+async def _sync_loop():
+    while True:
+        try:
+            await sync_search_index()
+        except Exception as e:
+            logger.warning(f"Work24 검색 인덱스 동기화 실패: {e}")
+        await asyncio.sleep(WORK24_SEARCH_SYNC_SEC)
+
+def start_background_refresh():
+    global _warm_task, _sync_task
+    if _warm_task is None and WORK24_KEY and WORK24_WARM_PAGES > 0:
+        _warm_task = asyncio.create_task(_warm_loop())
+    if _sync_task is None and WORK24_KEY and WORK24_SEARCH_SYNC_PAGES > 0:
+        _sync_task = asyncio.create_task(_sync_loop())
+
+async def stop_background_refresh():
+    global _warm_task, _sync_task
+    tasks = [t for t in (_warm_task, _sync_task, *_refill_tasks.values()) if t is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _warm_task = _sync_task = None
+    _refill_tasks.clear()
 
 # ----------------- 라우트 -----------------
 @router.get("/jobs")
@@ -171,57 +896,80 @@ async def get_jobs(
     if not WORK24_KEY:
         return JSONResponse({"ok": False, "detail": "WORK24_KEY not configured"}, status_code=500)
 
-    params = {"startPage": startPage, "display": display, "keyword": keyword, "region1": region1}
-
     try:
-        async with httpx.AsyncClient() as client:
-            items = await _fetch_list(client, params)
-
-        # 근무지 합성
-        await _enrich_regions(items, concurrency=6)
-
-        # region1이 들어오면 간단 정규화해서 필터
-        if region1:
-            def norm(s: str) -> str:
-                rep = {
-                    "서울특별시": "서울","경기도": "경기","경상남도":"경남","경상북도":"경북",
-                    "충청남도":"충남","충청북도":"충북","전라남도":"전남","전라북도":"전북",
-                    "강원특별자치도":"강원","제주특별자치도":"제주","부산광역시":"부산",
-                    "대구광역시":"대구","인천광역시":"인천","광주광역시":"광주",
-                    "대전광역시":"대전","울산광역시":"울산","세종특별자치시":"세종",
-                }
-                for k,v in rep.items():
-                    if k in s: return v
-                return s
-            want = norm(region1)
-            items = [it for it in items if it.get("workRegionNm") and norm(it["workRegionNm"]).find(want) != -1]
+        # region1이 들어오면 지역 인덱스로 필터 + display 개가 찰 때까지 다음 업스트림 페이지로 이어서 조회
+        if region1 and region1.strip():
+            items, has_more = await list_jobs_in_region(region1, startPage, display, keyword)
+            return {"ok": True, "items": items, "hasMore": has_more}
 
+        items = await list_jobs(startPage, display, keyword)
         return {"ok": True, "items": items}
 
     except Exception as e:
         return JSONResponse({"ok": False, "detail": str(e)}, status_code=500)
 
+@router.get("/jobs/search")
+async def search_jobs(
+    q: str = Query("", description="검색어 (단어별 부분 문자열 검색)"),
+    region1: Optional[str] = None,
+    page: int = Query(1, ge=1, le=1000),
+    size: int = Query(20, ge=1, le=100),
+):
+    """
+    로컬 색인 검색: 제목/회사/근무지/고용형태/자소서 문항 (부분 문자열), bm25 순위
+    - 항상 색인에서 바로 응답. 첫 페이지 결과가 모자라면 업스트림 제목 검색 결과를 백그라운드로 색인에 보충 (refilling)
+    - 색인을 쓸 수 없거나 아직 비어 있으면 업스트림 제목 검색으로 대체 (source 로 구분)
+    """
+    region = None
+    if region1 and region1.strip():
+        keys = region_keys(region1)
+        region = keys[0] if keys else normalize_region(region1.strip())
+    t0 = time.perf_counter()
+    try:
+        res = await asyncio.to_thread(job_index.search, q, region, page, size)
+    except sqlite3.Error as e:
+        logger.warning(f"Work24 검색 인덱스 조회 실패: {e}")
+        res = None
+    if res is not None:
+        refilling = page == 1 and len(res["items"]) < size and schedule_search_refill(q)
+        return {"ok": True, "source": "index", **res, "page": page, "size": size, "refilling": refilling,
+                "syncedAt": job_index.synced_at, "took_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+    if not WORK24_KEY:
+        return JSONResponse({"ok": False, "detail": "WORK24_KEY not configured"}, status_code=500)
+    try:
+        if region:
+            items, has_more = await list_jobs_in_region(region, page, size, q or None)
+        else:
+            items, has_more = await list_jobs(page, size, q or None), None
+        return {"ok": True, "source": "upstream", "items": items, "hasMore": has_more, "page": page, "size": size}
+    except Exception as e:
+        return JSONResponse({"ok": False, "detail": str(e)}, status_code=500)
+
+@router.get("/jobs/cache-stats")
+async def get_cache_stats():
+    # 업스트림 로딩 수 / 진행 중 로딩 합류 수 (동시 사용자 증가 시 loads 는 고유 공고 수에 비례해야 함)
+    return {"ok": True, "list": _LIST_CACHE.stats(), "detail": _DETAIL_CACHE.stats(),
+            "search": {"available": job_index.available, "syncedAt": job_index.synced_at,
+                       "size": await asyncio.to_thread(job_index.count)}}
+
 @router.get("/jobs/{emp_seqno}")
-async def get_job_detail(emp_seqno: str):
+async def get_job_detail(emp_seqno: str, raw: bool = Query(False, description="원본 XML 전체 트리 포함")):
     """
     단일 상세: workRegionNm + selfintroQstList 를 항상 포함해서 반환
     + 헤더에서 바로 쓰기 좋은 필드(title/company/endDate/logo/link 등)도 같이 제공
+    + detail: 프론트에서 쓰는 상세 필드 (raw=true 면 원본 전체도 포함)
     """
     if not WORK24_KEY:
         return JSONResponse({"ok": False, "detail": "WORK24_KEY not configured"}, status_code=500)
 
     try:
-        async with httpx.AsyncClient() as client:
-            q = {"authKey": WORK24_KEY, "returnType": "XML", "callTp": "D", "empSeqno": emp_seqno}
-            r = await client.get(DETAIL_URL, params=q, timeout=25)
-            r.raise_for_status()
-            data = _xml_to_dict(r.text) or {}
-
-        root = _get_first(data, "dhsOpenEmpInfoDetailRoot") or {}
+        cached = await _get_detail(emp_seqno)
+        root = cached["detail"]
 
         # ===== 보장 필드 =====
-        work_region = _parse_work_regions(root)
-        selfintro_list = _parse_selfintro_questions(root)
+        work_region = cached["workRegionNm"]
+        selfintro_list = cached["selfintroQstList"]
 
         # ===== 헤더/요약에 바로 쓰기 좋은 필드 =====
         item_title   = root.get("empWantedTitle") or ""
@@ -232,7 +980,7 @@ async def get_job_detail(emp_seqno: str):
         item_web     = root.get("empWantedHomepgDetail") or ""
         item_mob     = root.get("empWantedMobileUrl") or ""
 
-        return {
+        out = {
             "ok": True,
             "item": {
                 # 프론트에서 바로 쓸 필드
@@ -249,10 +997,14 @@ async def get_job_detail(emp_seqno: str):
                 "workRegionNm": work_region,           # 예: "서울·경기"
                 "selfintroQstList": selfintro_list,    # 예: ["성장과정...", "지원동기..."]
 
-                # 원본 전체: 추가 파싱용
-                "raw": data,
+                # 상세 필드 (모집분야/전형/직무 목록 포함)
+                "detail": root,
             },
         }
+        if raw:
+            # 원본 전체: 추가 파싱용 (요청 시에만)
+            out["item"]["raw"] = await _load_detail_raw(emp_seqno)
+        return out
 
     except Exception as e:
         return JSONResponse({"ok": False, "detail": str(e)}, status_code=500)
@@ -1,8 +1,10 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from starlette.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -12,14 +14,45 @@ from fastapi.staticfiles import StaticFiles
 from server.interview import router as interview_router
 from server.camera_analyzer import router as camera_router
 from server.profile import router as profile_router
-from api.routers.work24 import router as work24_router, get_jobs  # get_jobs 함수 추가
-from server.user_input import router as user_input_router  # 추가된 user-input 라우터
-from server.voice import router as analyze_router
+from api.routers.work24 import (  # get_jobs 함수 추가
+    router as work24_router, get_jobs, work24, start_background_refresh, stop_background_refresh,
+)
+from server.user_input import router as user_input_router, shutdown_parse_pool, ResumeUploadLimit  # 추가된 user-input 라우터
+from server.voice import router as analyze_router, analyze_jobs, stt_status, warm_up_stt, STT_WARMUP
+from server.stt_stream import router as stt_stream_router
 from server.result import router as result_router
 from server.result_save import router as result_save_router
 from server.result_load import router as result_load_router
-
-app = FastAPI()
+from server.supabase_rest import supabase
+from server.llm_client import openrouter
+from server.result_queue import result_queue, RESULT_WRITE_BEHIND
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작: 백그라운드 작업 큐 기동 / 종료: 정리
+    await supabase.start()
+    await openrouter.start()
+    await work24.start()
+    # 채용공고 첫 페이지들을 미리 캐시에 채워 둠
+    start_background_refresh()
+    await analyze_jobs.start()
+    # 결과 write-behind 큐: 지난 실행에서 남은 결과가 있으면 여기서 재전송 시작
+    if RESULT_WRITE_BEHIND:
+        await result_queue.start()
+    # STT 모델 로딩 + 워밍업은 백그라운드로 → 끝나면 /health 가 ready
+    warmup = asyncio.create_task(asyncio.to_thread(warm_up_stt)) if STT_WARMUP else None
+    yield
+    if warmup and not warmup.done():
+        warmup.cancel()
+    await analyze_jobs.stop()
+    await result_queue.stop()
+    shutdown_parse_pool()
+    await stop_background_refresh()
+    await work24.close()
+    await openrouter.close()
+    await supabase.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 허용 (프론트엔드와 통신 가능하도록)
 app.add_middleware(
@@ -29,6 +62,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 이력서 업로드 크기 제한 (폼 파싱 전에 413)
+app.add_middleware(ResumeUploadLimit)
+
 # 정적 파일 연결
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -48,7 +84,8 @@ async def user_input(request: Request):
 @app.get("/job-list", response_class=HTMLResponse)
 async def job_list(request: Request):
     # 오픈API에서 데이터 가져오기
-    jobs_response = await get_jobs()
+    # 직접 호출이므로 Query 기본값 대신 값을 명시 (목록 캐시에서 바로 응답)
+    jobs_response = await get_jobs(startPage=1, display=20, keyword=None, region1=None)
     if not jobs_response.get("ok"):
         # API 호출 실패 시 로그 출력 및 더미 데이터 사용
         print(f"Error fetching jobs: {jobs_response.get('error')}")
@@ -92,6 +129,7 @@ app.include_router(profile_router, prefix="/api")
 app.include_router(work24_router, prefix="/api", tags=["work24"])
 app.include_router(user_input_router, prefix="/api")  # 추가
 app.include_router(analyze_router, prefix="/api")
+app.include_router(stt_stream_router, prefix="/api")
 app.include_router(result_router, prefix="/api")
 app.include_router(result_save_router, prefix="/api")
 app.include_router(result_load_router, prefix="/api")
@@ -99,4 +137,7 @@ app.include_router(result_load_router, prefix="/api")
 # 헬스체크
 @app.get("/health")
 def health():
-    return {"ok": True}
+    # STT 워밍업 진행 중에만 503. 끝난 뒤에는 200 + ready/error 로 상태 보고 (실패해도 계속 503 이 되지 않도록)
+    if STT_WARMUP and stt_status["warming"]:
+        return JSONResponse(status_code=503, content={"ok": False, "ready": False, "stt": stt_status})
+    return {"ok": True, "ready": stt_status["ready"] or not STT_WARMUP, "stt": stt_status}
@@ -0,0 +1,57 @@
+# scripts/bench_stt.py — STT 백엔드별 실시간 배율(RTF) 측정
+# 같은 오디오 파일로 각 백엔드를 로딩 → 워밍업 → N회 추론해서 처리시간/오디오길이 를 출력
+#
+# 사용법 (프로젝트 루트에서):
+#   python -m scripts.bench_stt answer.webm
+#   python -m scripts.bench_stt answer.webm --backends whisper faster-whisper --runs 5 --model small
+import argparse
+import statistics
+import time
+
+from server.voice import SAMPLE_RATE, STT_BACKENDS, STT_MODEL, _decode_pcm_16k_mono, create_backend
+
+
+def bench(name: str, y, model: str, runs: int):
+    backend = create_backend(name, model=model)
+    t0 = time.perf_counter()
+    backend.load()
+    load_s = time.perf_counter() - t0
+
+    # 첫 추론은 워밍업으로 제외
+    backend.transcribe(y[:SAMPLE_RATE])
+
+    times, text = [], ""
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        text = backend.transcribe(y)
+        times.append(time.perf_counter() - t0)
+    return load_s, times, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 백엔드 RTF 벤치마크")
+    parser.add_argument("audio", help="테스트용 오디오 파일 (webm/wav 등, ffmpeg로 디코딩)")
+    parser.add_argument("--backends", nargs="+", default=list(STT_BACKENDS), choices=list(STT_BACKENDS))
+    parser.add_argument("--model", default=STT_MODEL)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.audio, "rb") as f:
+        y = _decode_pcm_16k_mono(f.read())
+    dur = y.size / SAMPLE_RATE
+    print(f"오디오: {args.audio} ({dur:.2f}s), 모델: {args.model}, 반복: {args.runs}")
+    print(f"{'backend':<16}{'load(s)':>10}{'mean(s)':>10}{'RTF':>8}{'RTF(min)':>10}")
+
+    for name in args.backends:
+        try:
+            load_s, times, text = bench(name, y, args.model, args.runs)
+        except Exception as e:
+            print(f"{name:<16} 실패: {e}")
+            continue
+        mean = statistics.mean(times)
+        print(f"{name:<16}{load_s:>10.2f}{mean:>10.2f}{mean / dur:>8.3f}{min(times) / dur:>10.3f}")
+        print(f"  └ {text[:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,16 @@ from fastapi.responses import FileResponse, Response
 import numpy as np
 import cv2
 import mediapipe as mp
-import math
 import os
+import math
+import time
+import struct
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from server.camera_session import open_session, touch_session
 
 router = APIRouter()
 
@@ -17,12 +25,81 @@ async def favicon():
 
 # ───────────────────── MediaPipe ─────────────────────
 mp_face = mp.solutions.face_mesh
-# refine_landmarks=True → 홍채(iris) 랜드마크 포함
-face_mesh = mp_face.FaceMesh(
-    static_image_mode=False,
-    max_num_faces=1,
-    refine_landmarks=True,
-)
+
+# 동시에 처리할 수 있는 카메라 세션 수 (= FaceMesh 인스턴스 수 = 분석 스레드 수)
+CAMERA_POOL_SIZE = max(1, int(os.getenv("CAMERA_POOL_SIZE", "4")))
+# 풀이 모두 사용 중일 때 새 세션이 인스턴스를 기다리는 최대 시간(초)
+CAMERA_LEASE_TIMEOUT = float(os.getenv("CAMERA_LEASE_TIMEOUT", "10"))
+
+def _new_face_mesh():
+    # refine_landmarks=True → 홍채(iris) 랜드마크 포함
+    return mp_face.FaceMesh(
+        static_image_mode=False,
+        max_num_faces=1,
+        refine_landmarks=True,
+    )
+
+class FaceMeshPool:
+    """
+    FaceMesh 인스턴스 풀.
+    - 세션(WebSocket 연결)마다 인스턴스 1개를 대여 → 사용자 간 트래킹 상태가 섞이지 않음
+    - 분석은 전용 스레드 풀에서 실행 → 이벤트 루프를 막지 않음
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle = []
+        self._created = 0
+        self._sem = asyncio.Semaphore(size)
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="facemesh")
+
+    @asynccontextmanager
+    async def lease(self, timeout: float = CAMERA_LEASE_TIMEOUT):
+        await asyncio.wait_for(self._sem.acquire(), timeout=timeout)
+        try:
+            if self._idle:
+                mesh = self._idle.pop()
+            else:
+                # 인스턴스는 필요할 때 생성(서버 기동 시간 단축)
+                mesh = await self.run(_new_face_mesh)
+                self._created += 1
+        except Exception:
+            self._sem.release()
+            raise
+        try:
+            yield mesh
+        finally:
+            # 다음 세션이 이전 사용자의 얼굴을 이어서 트래킹하지 않도록 초기화
+            await self.run(_reset_tracking, mesh)
+            self._idle.append(mesh)
+            self._sem.release()
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": len(self._idle),
+            "in_use": self._created - len(self._idle),
+        }
+
+def _reset_tracking(mesh):
+    # 얼굴이 없는 프레임을 한 번 넣으면 트래킹이 끊기고, 다음 프레임부터 검출을 새로 수행
+    try:
+        mesh.process(np.zeros((64, 64, 3), dtype=np.uint8))
+    except Exception:
+        pass
+
+face_mesh_pool = FaceMeshPool(CAMERA_POOL_SIZE)
+
+# ───────────────────── 전처리 설정 ─────────────────────
+# 긴 변이 이 값의 2배 이상인 JPEG는 1/2·1/4·1/8 축소 디코딩
+CAMERA_DECODE_MAX_SIDE = int(os.getenv("CAMERA_DECODE_MAX_SIDE", "640"))
+# 직전 얼굴 박스 주변으로 잘라낼 여백 (박스 한 변 대비 비율)
+CAMERA_ROI_MARGIN = float(os.getenv("CAMERA_ROI_MARGIN", "0.35"))
 
 # 주요 랜드마크 인덱스
 LEFT_EYE_CONTOUR  = [33, 160, 158, 133, 153, 144]
@@ -32,125 +109,337 @@ RIGHT_IRIS = [473, 474, 475, 476]
 MOUTH_LEFT, MOUTH_RIGHT = 61, 291
 MOUTH_UP, MOUTH_DOWN = 13, 14
 FACE_LEFT, FACE_RIGHT = 234, 454
-LEFT_EYE_OUTER, RIGHT_EYE_OUTER = 33, 263  # 백업
+NOSE_TIP = 1
+
+# 벡터 연산용 인덱스 배열 (0: 왼쪽 눈, 1: 오른쪽 눈)
+_EYE_CONTOURS = np.array([LEFT_EYE_CONTOUR, RIGHT_EYE_CONTOUR])  # (2, 6)
+_IRISES = np.array([LEFT_IRIS, RIGHT_IRIS])                      # (2, 4)
+
+# 시선 좌/우/센터 기준 변수
+LEFT_THRESH = 0.42
+RIGHT_THRESH = 0.58
 
 # ───────────────────── 유틸 ─────────────────────
-def _euclid(a, b):
-    return math.hypot(a.x - b.x, a.y - b.y)
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """MediaPipe 랜드마크(478개) → (N, 3) float32 배열. 프레임당 한 번만 변환"""
+    return np.array([(p.x, p.y, p.z) for p in landmarks], dtype=np.float32)
 
-def _center(points):
-    x = sum(p.x for p in points) / len(points)
-    y = sum(p.y for p in points) / len(points)
-    return x, y
+def score_landmarks(pts: np.ndarray) -> dict:
+    """
+    랜드마크 배열 (N,3) 또는 배치 (B,N,3) → 프레임별 특징 배열 (각 shape (B,))
+    - yaw: 얼굴 좌우 회전 정규값
+    - gaze_x / gaze_y: 눈 박스 안에서 홍채 중심의 상대좌표 (0~1)
+    - smile: 0.0 ~ 1.0
+    녹화해 둔 랜드마크 배열을 오프라인으로 채점할 때도 그대로 사용할 수 있음
+    """
+    pts = np.asarray(pts, dtype=np.float32)
+    if pts.ndim == 2:
+        pts = pts[None]
+    xy = pts[..., :2]
 
-def _eye_bbox(landmarks, idxs):
-    xs = [landmarks[i].x for i in idxs]
-    ys = [landmarks[i].y for i in idxs]
-    return min(xs), min(ys), max(xs), max(ys)
+    # 얼굴 방향
+    xl = xy[:, FACE_LEFT, 0]
+    xr = xy[:, FACE_RIGHT, 0]
+    face_w = np.abs(xr - xl) + 1e-6
+    yaw = (xy[:, NOSE_TIP, 0] - (xl + xr) / 2) / face_w
+
+    # 시선: 홍채 중심 vs 눈 박스 상대좌표 (양쪽 눈 평균)
+    eyes = xy[:, _EYE_CONTOURS]                 # (B, 2, 6, 2)
+    lo, hi = eyes.min(axis=2), eyes.max(axis=2)  # (B, 2, 2)
+    iris = xy[:, _IRISES].mean(axis=2)          # (B, 2, 2)
+    gaze = ((iris - lo) / (hi - lo + 1e-6)).mean(axis=1)  # (B, 2)
+
+    # 미소: 입 가로/세로 비율 기반 휴리스틱
+    # 무표정은 0에 가깝게, 살짝 웃으면 빠르게 1.0 근처로
+    mouth_w = np.linalg.norm(xy[:, MOUTH_LEFT] - xy[:, MOUTH_RIGHT], axis=-1)
+    mouth_h = np.linalg.norm(xy[:, MOUTH_UP] - xy[:, MOUTH_DOWN], axis=-1)
+    width_ratio = mouth_w / (face_w + 1e-6)   # 입 너비 / 얼굴 폭
+    open_ratio  = mouth_h / (face_w + 1e-6)   # 입 높이 / 얼굴 폭
+
+    # 1) 기준을 높게(0.36) 잡고, 0.06만 늘어나도 상한(≈1)에 도달하도록 급경사
+    raw = (width_ratio - 0.36) / 0.06
+    # 2) 말할 때 과한 점수 방지: 입높이비율 0.16부터 감점, 가중치 0.50
+    raw -= np.maximum(0.0, (open_ratio - 0.16) / 0.20) * 0.50
+    # 3) 0~1.2 클램프 후 감마 보정
+    raw = np.clip(raw, 0.0, 1.2)
+    smile = np.minimum(1.0, raw ** 0.2)
+    # 4) 무표정 데드존: 입너비비율이 0.30보다 작으면 0점
+    smile = np.where(width_ratio < 0.30, 0.0, smile)
+
+    return {"yaw": yaw, "gaze_x": gaze[:, 0], "gaze_y": gaze[:, 1], "smile": smile}
+
+def label_features(feats: dict) -> list:
+    """score_landmarks 결과 → 프레임별 결과 dict 리스트 (WebSocket 응답 형식)"""
+    yaw, gx = feats["yaw"], feats["gaze_x"]
+    direction = np.select([np.abs(yaw) < 0.10, yaw > 0.10], ["정면", "오른쪽 측면"], "왼쪽 측면")
+    gaze = np.select([gx < LEFT_THRESH, gx > RIGHT_THRESH], ["좌", "우"], "센터")
+    return [
+        {"direction": str(d), "gaze": str(g), "smile": round(float(s), 2), "yaw": round(float(y), 3)}
+        for d, g, s, y in zip(direction, gaze, feats["smile"], yaw)
+    ]
+
+def score_batch(pts: np.ndarray) -> list:
+    # (B,N,3) 배치를 한 번의 벡터 연산으로 채점
+    return label_features(score_landmarks(pts))
+
+# ───────────────────── 전처리 ─────────────────────
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def _jpeg_size(buf: bytes):
+    """JPEG 헤더(SOFn)에서 (width, height)만 읽기. 전체 디코딩 없이 해상도 확인"""
+    if buf[:2] != b"\xff\xd8":
+        return None
+    i, n = 2, len(buf)
+    while i + 9 < n:
+        if buf[i] != 0xFF:
+            i += 1
+            continue
+        marker = buf[i + 1]
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # 채움 바이트 / 길이 없는 마커
+            i += 1 if marker == 0xFF else 2
+            continue
+        if marker in _SOF_MARKERS:
+            h = int.from_bytes(buf[i + 5:i + 7], "big")
+            w = int.from_bytes(buf[i + 7:i + 9], "big")
+            return w, h
+        i += 2 + int.from_bytes(buf[i + 2:i + 4], "big")
+    return None
+
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+def decode_frame(buf: bytes, max_side: int = CAMERA_DECODE_MAX_SIDE):
+    """
+    JPEG 디코딩. 긴 변이 max_side보다 충분히 크면 축소 디코딩(IDCT 단계에서 축소 → 훨씬 빠름)
+    축소 후에도 긴 변은 max_side 이상을 유지
+    """
+    flag = cv2.IMREAD_COLOR
+    size = _jpeg_size(buf)
+    if size:
+        longest = max(size)
+        for factor, reduced in _REDUCED_FLAGS:
+            if longest // factor >= max_side:
+                flag = reduced
+                break
+    return cv2.imdecode(np.frombuffer(buf, np.uint8), flag)
+
+class FaceTracker:
+    """
+    세션별 ROI 상태.
+    bbox: 직전 프레임 얼굴 박스 (정규화 좌표 x0, y0, x1, y1). 트래킹을 놓치면 None
+    """
+
+    def __init__(self, margin: float = CAMERA_ROI_MARGIN):
+        self.margin = margin
+        self.bbox = None
+
+    def roi(self, w: int, h: int):
+        # 직전 얼굴 박스 + 여백을 정사각형 픽셀 영역으로 (프레임 밖은 잘라냄)
+        x0, y0, x1, y1 = self.bbox
+        cx, cy = (x0 + x1) / 2 * w, (y0 + y1) / 2 * h
+        half = max((x1 - x0) * w, (y1 - y0) * h) * (0.5 + self.margin)
+        rx0, ry0 = max(0, int(cx - half)), max(0, int(cy - half))
+        rx1, ry1 = min(w, int(cx + half) + 1), min(h, int(cy + half) + 1)
+        if rx1 - rx0 < 32 or ry1 - ry0 < 32:
+            return None
+        return rx0, ry0, rx1, ry1
+
+    def update(self, pts):
+        if pts is None:
+            self.bbox = None
+            return
+        lo, hi = pts[:, :2].min(axis=0), pts[:, :2].max(axis=0)
+        self.bbox = (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+def _detect_landmarks(image_bgr, face_mesh):
+    rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+    res = face_mesh.process(rgb)
+    if not res.multi_face_landmarks:
+        return None
+    return landmarks_to_array(res.multi_face_landmarks[0].landmark)
 
 # ───────────────────── 분석 함수 ─────────────────────
-def analyze_frame(image_bgr):
+def analyze_frame(image_bgr, face_mesh, tracker: FaceTracker = None):
     """
-    1프레임을 분석해 다음을 반환:
+    1프레임을 분석해 다음을 반환 (face_mesh: 세션이 대여한 FaceMesh 인스턴스):
     - direction: '정면' / '왼쪽 측면' / '오른쪽 측면'
     - gaze: '센터' / '좌' / '우'     ← (요청대로 상/하 제거)
     - smile: 0.00 ~ 1.00             ← (기준 낮추고 변화폭 키움)
     - yaw: 얼굴 좌우 회전 정규값(진단용)
+    tracker가 있으면 직전 얼굴 주변만 잘라서 분석하고, 놓쳤을 때만 전체 프레임을 탐색
     """
-    rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
-    res = face_mesh.process(rgb)
+    h, w = image_bgr.shape[:2]
+    pts = None
 
-    out = {"direction": "알 수 없음", "gaze": "알 수 없음", "smile": None, "yaw": None}
-    if not res.multi_face_landmarks:
-        return out
+    roi = tracker.roi(w, h) if tracker is not None and tracker.bbox is not None else None
+    if roi is not None:
+        x0, y0, x1, y1 = roi
+        pts = _detect_landmarks(image_bgr[y0:y1, x0:x1], face_mesh)
+        if pts is not None:
+            # ROI 정규화 좌표 → 전체 프레임 정규화 좌표 (특징 계산은 기존과 동일한 좌표계)
+            cw, ch = x1 - x0, y1 - y0
+            pts[:, 0] = (x0 + pts[:, 0] * cw) / w
+            pts[:, 1] = (y0 + pts[:, 1] * ch) / h
+            pts[:, 2] *= cw / w
 
-    lm = res.multi_face_landmarks[0].landmark
+    if pts is None:
+        # 트래킹 상실(또는 첫 프레임) → 전체 프레임 탐색
+        pts = _detect_landmarks(image_bgr, face_mesh)
 
-    # 얼굴 방향
-    nose = lm[1] if len(lm) > 1 else lm[0]
-    xl = lm[FACE_LEFT].x if len(lm) > FACE_LEFT else lm[LEFT_EYE_OUTER].x
-    xr = lm[FACE_RIGHT].x if len(lm) > FACE_RIGHT else lm[RIGHT_EYE_OUTER].x
-    face_w = abs(xr - xl) + 1e-6
-    yaw_norm = (nose.x - (xl + xr) / 2) / face_w
-    out["yaw"] = round(float(yaw_norm), 3)
-
-    # 정면/측면 라벨링(그대로 유지)
-    if abs(yaw_norm) < 0.10:
-        out["direction"] = "정면"
-    elif yaw_norm > 0.10:
-        out["direction"] = "오른쪽 측면"
-    else:
-        out["direction"] = "왼쪽 측면"
-
-    # 시선: 홍채 중심 vs 눈 박스 상대좌표
-    lx0, ly0, lx1, ly1 = _eye_bbox(lm, LEFT_EYE_CONTOUR)
-    rx0, ry0, rx1, ry1 = _eye_bbox(lm, RIGHT_EYE_CONTOUR)
-    lix, liy = _center([lm[i] for i in LEFT_IRIS])
-    rix, riy = _center([lm[i] for i in RIGHT_IRIS])
-
-    def _norm_xy(x, y, x0, y0, x1, y1):
-        return ((x - x0) / (x1 - x0 + 1e-6), (y - y0) / (y1 - y0 + 1e-6))
-
-    lnx, lny = _norm_xy(lix, liy, lx0, ly0, lx1, ly1)
-    rnx, rny = _norm_xy(rix, riy, rx0, ry0, rx1, ry1)
-    gx, gy = (lnx + rnx) / 2.0, (lny + rny) / 2.0  # 0~1
-
-    # 좌/우/센터만
-    #센터 기준 변수
-    LEFT_THRESH = 0.42
-    RIGHT_THRESH = 0.58
-    if gx < LEFT_THRESH:
-        gaze = "좌"
-    elif gx > RIGHT_THRESH:
-        gaze = "우"
-    else:
-        gaze = "센터"
-    out["gaze"] = gaze
+    if tracker is not None:
+        tracker.update(pts)
 
-    # 미소: 입 가로/세로 비율 기반 휴리스틱
-    # 입 너비/높이 비율 계산
-    # 미소: 무표정≈0, 조금만 웃어도 1에 가까워짐
-    # 미소: 무표정은 0에 가깝게, 살짝 웃으면 빠르게 1.0 근처로
-    ml, mr, mu, md = lm[MOUTH_LEFT], lm[MOUTH_RIGHT], lm[MOUTH_UP], lm[MOUTH_DOWN]
-    mouth_w = _euclid(ml, mr)
-    mouth_h = _euclid(mu, md)
+    if pts is None:
+        return {"direction": "알 수 없음", "gaze": "알 수 없음", "smile": None, "yaw": None}
+    return score_batch(pts)[0]
 
-    width_ratio = mouth_w / (face_w + 1e-6)   # 입 너비 / 얼굴 폭
-    open_ratio  = mouth_h / (face_w + 1e-6)   # 입 높이 / 얼굴 폭
 
-    # 1) 무표정 데드존: 입너비비율이 0.35보다 작으면 0점
-    if width_ratio < 0.30:
-        smile = 0.0
-    else:
-        # 2) 기준을 높게(0.36) 잡고, 0.06만 늘어나도 상한(≈1)에 도달하도록 급경사
-        raw = (width_ratio - 0.36) / 0.06
+def _decode_and_analyze(buf: bytes, face_mesh, tracker: FaceTracker = None):
+    # 디코딩 + 분석을 한 번에 워커 스레드에서 실행
+    frame = decode_frame(buf)
+    if frame is None:
+        return None
+    return analyze_frame(frame, face_mesh, tracker)
+
+# ───────────────────── 프레임 우편함 ─────────────────────
+class LatestFrameMailbox:
+    """
+    1칸짜리 우편함 (latest-frame-wins).
+    분석이 끝나기 전에 새 프레임이 도착하면 이전 프레임은 버리고 dropped를 증가시킨다.
+    → 클라이언트 전송 속도가 분석 속도보다 빨라도 결과가 밀리지 않음
+    """
+
+    def __init__(self):
+        self._item = None
+        self._event = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
 
-        # 3) 말할 때 과한 점수 방지: 입높이비율 0.16부터 감점, 가중치 0.50
-        raw -= max(0.0, (open_ratio - 0.16) / 0.20) * 0.50
+    def put(self, buf: bytes):
+        if self._item is not None:
+            self.dropped += 1
+        self._item = (buf, time.perf_counter())
+        self._event.set()
 
-        # 4) 0~1.2 클램프 후, 감마>1(1.25)로 저강도 과대평가 억제
-        raw = max(0.0, min(1.2, raw))
-        smile = min(1.0, raw ** 0.2)
+    def close(self):
+        self._closed = True
+        self._event.set()
 
-    out["smile"] = round(float(smile), 2)
+    async def get(self):
+        # (buf, 수신 시각) 반환. 연결이 끊기고 남은 프레임이 없으면 None
+        while self._item is None:
+            if self._closed:
+                return None
+            self._event.clear()
+            await self._event.wait()
+        item, self._item = self._item, None
+        return item
 
-    return out
+async def _receive_frames(websocket: WebSocket, mailbox: LatestFrameMailbox):
+    try:
+        while True:
+            mailbox.put(await websocket.receive_bytes())
+    finally:
+        mailbox.close()
+
+# ───────────────────── 압축 바이너리 프로토콜 (proto=bin) ─────────────────────
+# 업스트림:   [seq u32][client_ts f64(ms)] + JPEG 바이트
+# 다운스트림: [status u8][seq u32][client_ts f64][direction u8][gaze u8][smile f32][yaw f32][dropped u32][latency_ms f32]
+#   - status: 0 = 성공, 1 = decode_fail
+#   - smile/yaw: 얼굴 미검출이면 NaN
+#   - client_ts 는 그대로 돌려줌 → 클라이언트가 프레임별 왕복 지연 측정
+UP_HEADER = struct.Struct("<Id")
+DOWN_RESULT = struct.Struct("<BIdBBffIf")
+DIRECTION_CODES = {"알 수 없음": 0, "정면": 1, "왼쪽 측면": 2, "오른쪽 측면": 3}
+GAZE_CODES = {"알 수 없음": 0, "센터": 1, "좌": 2, "우": 3}
+STATUS_OK, STATUS_DECODE_FAIL = 0, 1
+
+def split_frame_header(buf: bytes):
+    """바이너리 모드 업스트림 → (seq, client_ts, JPEG memoryview). 헤더가 짧으면 None"""
+    if len(buf) < UP_HEADER.size:
+        return None
+    seq, client_ts = UP_HEADER.unpack_from(buf)
+    return seq, client_ts, memoryview(buf)[UP_HEADER.size:]
 
+def pack_result(seq: int, client_ts: float, result, dropped: int, latency_ms: float) -> bytes:
+    if result is None:
+        return DOWN_RESULT.pack(STATUS_DECODE_FAIL, seq, client_ts, 0, 0, math.nan, math.nan, dropped, latency_ms)
+    smile, yaw = result.get("smile"), result.get("yaw")
+    return DOWN_RESULT.pack(
+        STATUS_OK, seq, client_ts,
+        DIRECTION_CODES.get(result.get("direction"), 0),
+        GAZE_CODES.get(result.get("gaze"), 0),
+        math.nan if smile is None else smile,
+        math.nan if yaw is None else yaw,
+        dropped, latency_ms,
+    )
 
 # ───────────────────── WebSocket ─────────────────────
+@router.get("/ws/stats")
+async def ws_stats():
+    return {"ok": True, "pool": face_mesh_pool.stats()}
+
 @router.websocket("/ws")
-async def ws_endpoint(websocket: WebSocket):
+async def ws_endpoint(websocket: WebSocket, session: Optional[str] = None, proto: str = "json"):
     await websocket.accept()
+    binary = proto == "bin"
     try:
-        while True:
-            buf = await websocket.receive_bytes()
-            arr = np.frombuffer(buf, np.uint8)
-            frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-            if frame is None:
-                await websocket.send_json({"ok": False, "err": "decode_fail"})
-                continue
-
-            result = analyze_frame(frame)
-            await websocket.send_json({"ok": True, "result": result})
+        async with face_mesh_pool.lease() as face_mesh:
+            # 세션 통계는 서버에서 누적 → /api/result?session= 로 최종 점수 조회
+            stats = open_session(session)
+            hello = {"ok": True, "session": stats.session_id, "proto": "bin" if binary else "json"}
+            if binary:
+                # 클라이언트가 enum 코드를 라벨로 되돌릴 수 있도록 한 번만 전달
+                hello["enums"] = {"direction": DIRECTION_CODES, "gaze": GAZE_CODES}
+            await websocket.send_json(hello)
+
+            # 수신 태스크는 최신 프레임만 우편함에 남기고, 이 루프는 우편함을 비우며 분석
+            mailbox = LatestFrameMailbox()
+            tracker = FaceTracker()
+            recv_task = asyncio.create_task(_receive_frames(websocket, mailbox))
+            reported_dropped = 0  # 이 연결에서 세션 통계에 이미 반영한 버린 프레임 수
+            try:
+                while True:
+                    item = await mailbox.get()
+                    if item is None:
+                        break
+                    buf, received_at = item
+                    seq, client_ts = 0, 0.0
+                    if binary:
+                        parsed = split_frame_header(buf)
+                        if parsed is None:
+                            await websocket.send_bytes(pack_result(0, 0.0, None, mailbox.dropped, 0.0))
+                            continue
+                        seq, client_ts, buf = parsed
+                    result = await face_mesh_pool.run(_decode_and_analyze, buf, face_mesh, tracker)
+                    latency_ms = round((time.perf_counter() - received_at) * 1000, 1)
+                    if result is not None:
+                        stats.add(result, mailbox.dropped - reported_dropped)
+                        reported_dropped = mailbox.dropped
+                        touch_session(stats)
+                    if binary:
+                        await websocket.send_bytes(pack_result(seq, client_ts, result, mailbox.dropped, latency_ms))
+                        continue
+                    if result is None:
+                        await websocket.send_json({"ok": False, "err": "decode_fail", "dropped": mailbox.dropped})
+                        continue
+                    await websocket.send_json({
+                        "ok": True,
+                        "result": result,
+                        "dropped": mailbox.dropped,     # 이 연결에서 버린 프레임 수 (세션 누적은 /api/result)
+                        "latency_ms": latency_ms,       # 수신 → 결과 전송 직전
+                    })
+            finally:
+                recv_task.cancel()
+                await asyncio.gather(recv_task, return_exceptions=True)
+        print("❌ WebSocket 연결 종료")
+    except asyncio.TimeoutError:
+        # 풀의 모든 인스턴스가 사용 중
+        await websocket.send_json({"ok": False, "err": "busy"})
+        await websocket.close(code=1013)
     except WebSocketDisconnect:
         print("❌ WebSocket 연결 종료")
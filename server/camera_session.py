@@ -0,0 +1,132 @@
+# server/camera_session.py — 카메라 분석 세션별 누적 통계
+# 프레임을 저장하지 않고 카운터/평균/분산/히스토그램만 유지 → 세션당 메모리 일정, 요약은 O(1)
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# 보관할 최대 세션 수 / 마지막 갱신 후 보관 시간(초)
+CAMERA_SESSION_MAX = int(os.getenv("CAMERA_SESSION_MAX", "1000"))
+CAMERA_SESSION_TTL = float(os.getenv("CAMERA_SESSION_TTL", str(6 * 3600)))
+
+# yaw 히스토그램: -0.5 ~ 0.5 를 0.1 간격 10칸 + 양쪽 범위 밖 1칸씩
+YAW_BIN_MIN, YAW_BIN_MAX, YAW_BIN_COUNT = -0.5, 0.5, 10
+
+
+class CameraSessionStats:
+    """한 세션의 누적 통계 (camera_ai.js 의 calculateFinalScores 와 같은 기준으로 점수 계산)"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.frames = 0
+        self.direction_counts: Dict[str, int] = {}
+        self.gaze_counts: Dict[str, int] = {}
+        # 미소: 얼굴이 검출된 프레임 기준 Welford 평균/분산
+        self.smile_n = 0
+        self.smile_mean = 0.0
+        self.smile_m2 = 0.0
+        self.yaw_hist = [0] * (YAW_BIN_COUNT + 2)
+        self.dropped = 0
+
+    def add(self, result: Dict, dropped: int = 0):
+        # dropped: 지난 add 이후 새로 버린 프레임 수 (재연결해도 이전 연결의 값에 더해짐)
+        self.frames += 1
+        self.updated_at = time.time()
+        self.dropped += dropped
+
+        d, g = result.get("direction"), result.get("gaze")
+        self.direction_counts[d] = self.direction_counts.get(d, 0) + 1
+        self.gaze_counts[g] = self.gaze_counts.get(g, 0) + 1
+
+        smile = result.get("smile")
+        if smile is not None:
+            self.smile_n += 1
+            delta = smile - self.smile_mean
+            self.smile_mean += delta / self.smile_n
+            self.smile_m2 += delta * (smile - self.smile_mean)
+
+        yaw = result.get("yaw")
+        if yaw is not None:
+            if yaw < YAW_BIN_MIN:
+                idx = 0
+            elif yaw >= YAW_BIN_MAX:
+                idx = YAW_BIN_COUNT + 1
+            else:
+                idx = 1 + int((yaw - YAW_BIN_MIN) / (YAW_BIN_MAX - YAW_BIN_MIN) * YAW_BIN_COUNT)
+            self.yaw_hist[idx] += 1
+
+    def scores(self) -> Dict[str, int]:
+        n = self.frames
+        if n == 0:
+            return {"direction": 0, "gaze": 0, "smile": 0, "overall": 0}
+        # 방향: 정면 100, 그 외 50 / 시선: 센터 100, 그 외 60 / 미소: 0~1 → 0~100 (미검출은 0)
+        front = self.direction_counts.get("정면", 0)
+        center = self.gaze_counts.get("센터", 0)
+        direction = (100 * front + 50 * (n - front)) / n
+        gaze = (100 * center + 60 * (n - center)) / n
+        smile = self.smile_mean * self.smile_n / n * 100
+        # 전체 점수 (방향 30%, 시선 40%, 미소 30%)
+        overall = direction * 0.3 + gaze * 0.4 + smile * 0.3
+        return {
+            "direction": round(direction),
+            "gaze": round(gaze),
+            "smile": round(smile),
+            "overall": round(overall),
+        }
+
+    def summary(self) -> Dict:
+        var = self.smile_m2 / self.smile_n if self.smile_n > 1 else 0.0
+        edges = [round(YAW_BIN_MIN + i * (YAW_BIN_MAX - YAW_BIN_MIN) / YAW_BIN_COUNT, 2)
+                 for i in range(YAW_BIN_COUNT + 1)]
+        return {
+            "session": self.session_id,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "durationSec": round(self.updated_at - self.created_at, 1),
+            "direction": dict(self.direction_counts),
+            "gaze": dict(self.gaze_counts),
+            "smile": {"n": self.smile_n, "mean": round(self.smile_mean, 4), "var": round(var, 4)},
+            "yawHistogram": {"edges": edges, "counts": list(self.yaw_hist)},
+        }
+
+
+# ----------------- 세션 저장소 (프로세스 메모리, 오래된 세션부터 제거) -----------------
+_SESSIONS: "OrderedDict[str, CameraSessionStats]" = OrderedDict()
+
+
+def _evict(now: float):
+    while _SESSIONS:
+        sid, st = next(iter(_SESSIONS.items()))
+        if len(_SESSIONS) > CAMERA_SESSION_MAX or now - st.updated_at > CAMERA_SESSION_TTL:
+            _SESSIONS.pop(sid)
+        else:
+            break
+
+
+def get_session(session_id: Optional[str]) -> Optional[CameraSessionStats]:
+    if not session_id:
+        return None
+    st = _SESSIONS.get(session_id)
+    if st is None or time.time() - st.updated_at > CAMERA_SESSION_TTL:
+        return None
+    return st
+
+
+def open_session(session_id: Optional[str] = None) -> CameraSessionStats:
+    """기존 세션 id면 이어서 누적(재연결), 아니면 서버에서 새 id 발급"""
+    st = get_session(session_id)
+    if st is None:
+        st = CameraSessionStats(uuid.uuid4().hex)
+        _SESSIONS[st.session_id] = st
+    _SESSIONS.move_to_end(st.session_id)
+    _evict(time.time())
+    return st
+
+
+def touch_session(st: CameraSessionStats):
+    # 최근 갱신 세션을 뒤로 → 앞쪽부터 만료/제거
+    if st.session_id in _SESSIONS:
+        _SESSIONS.move_to_end(st.session_id)
@@ -1,11 +1,8 @@
-import os
-import requests
+import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from dotenv import load_dotenv
 
-load_dotenv()
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+from server.llm_client import openrouter, LLMBusy, LLMError, OPENROUTER_API_KEY
 
 router = APIRouter()
 
@@ -19,32 +16,29 @@ class Prompt(BaseModel):
     system_prompt: str = ""
 
 @router.post("/generate-text")
-def generate_text(data: Prompt):
+async def generate_text(data: Prompt):
     prompt = data.prompt.strip()
     if not prompt:
         raise HTTPException(status_code=400, detail="EMPTY_PROMPT")
 
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    
     # 메시지 구성 (system_prompt가 있으면 system 메시지로 추가)
     messages = []
     if data.system_prompt and data.system_prompt.strip():
         messages.append({"role": "system", "content": data.system_prompt.strip()})
     messages.append({"role": "user", "content": prompt})
-    
-    body = {
-        "model": "anthropic/claude-3-haiku",
-        "messages": messages,
-    }
+
+    # 공용 비동기 클라이언트 (연결 풀 / 동시 호출 제한 / 재시도)
     try:
-        r = requests.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=body, timeout=60)
-        r.raise_for_status()
-        answer = r.json()["choices"][0]["message"]["content"]
+        answer = await openrouter.chat(messages)
         return {"answer": answer}
-    except requests.RequestException as e:
+    except LLMBusy:
+        raise HTTPException(status_code=503, detail="LLM_BUSY")
+    except (LLMError, httpx.HTTPError) as e:
         raise HTTPException(status_code=502, detail=f"OPENROUTER_ERROR: {str(e)}")
 
+@router.get("/generate-text/metrics")
+async def generate_text_metrics():
+    # 호출 수 / 지연시간 백분위 / 토큰 사용량
+    return openrouter.metrics()
+
 
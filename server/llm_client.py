@@ -0,0 +1,177 @@
+# server/llm_client.py — 공용 비동기 OpenRouter 클라이언트
+# 앱 시작 시 httpx.AsyncClient 하나를 만들고 종료 시 닫음 → 질문 생성 요청들이 keep-alive 연결 풀을 공유
+# 동시 호출 수 제한 + 429/5xx 재시도 + 호출별 지연시간/토큰 지표
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_URL = os.getenv("OPENROUTER_URL", "https://openrouter.ai/api/v1")
+OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "anthropic/claude-3-haiku")
+# 응답 대기 / 연결 타임아웃(초)
+OPENROUTER_TIMEOUT = float(os.getenv("OPENROUTER_TIMEOUT", "60"))
+OPENROUTER_CONNECT_TIMEOUT = float(os.getenv("OPENROUTER_CONNECT_TIMEOUT", "5"))
+# 동시에 진행할 최대 호출 수 / 자리가 날 때까지 기다릴 최대 시간(초, 넘으면 503)
+OPENROUTER_MAX_CONCURRENCY = int(os.getenv("OPENROUTER_MAX_CONCURRENCY", "16"))
+OPENROUTER_QUEUE_TIMEOUT = float(os.getenv("OPENROUTER_QUEUE_TIMEOUT", "30"))
+OPENROUTER_RETRIES = int(os.getenv("OPENROUTER_RETRIES", "2"))
+OPENROUTER_BACKOFF = float(os.getenv("OPENROUTER_BACKOFF", "0.5"))  # 첫 재시도 대기(초), 이후 2배씩
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMBusy(RuntimeError):
+    pass
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+class OpenRouterClient:
+    def __init__(self, max_concurrency: int = OPENROUTER_MAX_CONCURRENCY):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._in_flight = 0
+        self._waiting = 0
+        self._calls = 0
+        self._failed = 0
+        self._retries = 0
+        self._busy = 0
+        self._prompt_tokens = 0
+        self._completion_tokens = 0
+        # 최근 호출의 지연시간(초) — 백분위 계산용
+        self._latencies = deque(maxlen=500)
+
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=OPENROUTER_URL,
+            headers={
+                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(OPENROUTER_TIMEOUT, connect=OPENROUTER_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=60,
+            ),
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def chat(self, messages: List[Dict[str, str]], model: Optional[str] = None, **params) -> str:
+        if self._client is None:
+            # lifespan 밖(스크립트 등)에서 호출된 경우 지연 생성
+            await self.start()
+        body = {"model": model or OPENROUTER_MODEL, "messages": messages, **params}
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=OPENROUTER_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._busy += 1
+            raise LLMBusy("LLM_BUSY")
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        t0 = time.perf_counter()
+        try:
+            data = await self._post(body)
+            self._calls += 1
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._sem.release()
+            self._latencies.append(time.perf_counter() - t0)
+
+        usage = data.get("usage") or {}
+        self._prompt_tokens += int(usage.get("prompt_tokens") or 0)
+        self._completion_tokens += int(usage.get("completion_tokens") or 0)
+        try:
+            return data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise LLMError(f"unexpected response: {str(data)[:200]}")
+
+    async def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            try:
+                r = await self._client.post("/chat/completions", json=body)
+                if r.status_code not in RETRY_STATUS or attempt >= OPENROUTER_RETRIES:
+                    if r.is_error:
+                        raise LLMError(f"{r.status_code}: {r.text[:200]}")
+                    try:
+                        data = r.json()
+                    except ValueError:
+                        data = None
+                    if not isinstance(data, dict):
+                        # 2xx 인데 JSON 객체가 아닌 본문 (프록시 오류 페이지 등)
+                        raise LLMError(f"invalid response ({r.status_code}): {r.text[:200]}")
+                    return data
+                # 429 는 Retry-After 를 우선 따름
+                wait = _retry_after(r)
+                logger.warning(f"OpenRouter {r.status_code}, 재시도 {attempt + 1}/{OPENROUTER_RETRIES}")
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                if attempt >= OPENROUTER_RETRIES:
+                    raise LLMError(f"{e.__class__.__name__}: {e}")
+                wait = None
+                logger.warning(f"OpenRouter {e.__class__.__name__}, 재시도 {attempt + 1}/{OPENROUTER_RETRIES}")
+            self._retries += 1
+            # 지수 백오프 + 지터
+            await asyncio.sleep(wait if wait is not None else OPENROUTER_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+            attempt += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        lat = sorted(self._latencies)
+
+        def pct(p: float) -> Optional[float]:
+            if not lat:
+                return None
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000)
+
+        return {
+            "ok": True,
+            "model": OPENROUTER_MODEL,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "calls": self._calls,
+            "failed": self._failed,
+            "retries": self._retries,
+            "busy_rejected": self._busy,
+            "prompt_tokens": self._prompt_tokens,
+            "completion_tokens": self._completion_tokens,
+            "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+        }
+
+
+def _retry_after(r: httpx.Response) -> Optional[float]:
+    try:
+        return min(float(r.headers.get("retry-after", "")), 30.0)
+    except ValueError:
+        return None
+
+
+# 앱 전체가 공유하는 인스턴스 (app.py lifespan 에서 start/close)
+openrouter = OpenRouterClient()
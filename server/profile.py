@@ -1,15 +1,21 @@
 # server/profile.py
+import os
+from typing import Dict, List
+
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import os
-import requests
+
+from server.supabase_rest import supabase
 
 router = APIRouter()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")  # https://xxxx.supabase.co
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 TABLE = "profiles"
+# upsert 충돌 기준 컬럼 — 테이블에 unique 인덱스 필요
+#   create unique index if not exists profiles_email_key on profiles (email);
+UNIQUE_KEY = os.getenv("PROFILE_UNIQUE_KEY", "email")
+# 일괄 upsert 1회 최대 건수
+BULK_MAX = int(os.getenv("PROFILE_BULK_MAX", "1000"))
 
 class Profile(BaseModel):
     name: str
@@ -18,47 +24,56 @@ class Profile(BaseModel):
     education: str = None
     experience: str = None
 
+def _response(response):
+    # 응답 처리
+    if response.status_code >= 400:
+        return JSONResponse(
+            status_code=response.status_code,
+            content={"ok": False, "error": response.text}
+        )
+
+    # 응답이 204라면 JSON 없음
+    if response.status_code == 204 or not response.text.strip():
+        return {"ok": True, "data": None}
+
+    return {"ok": True, "data": response.json()}
+
 @router.post("/profile")
 async def save_profile(profile: Profile):
+    """단일 프로필 저장: PostgREST upsert 1회 (조회 후 PATCH/POST 없이 원자적으로 처리)"""
     try:
-        url = f"{SUPABASE_URL}/rest/v1/{TABLE}"
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-        }
+        row = profile.dict()
+        if not row.get(UNIQUE_KEY):
+            return JSONResponse(status_code=400, content={"ok": False, "error": f"{UNIQUE_KEY} 값이 필요합니다."})
 
-        # 기존 데이터 조회
-        query_url = f"{url}?name=eq.{profile.name}"
-        res = requests.get(query_url, headers=headers)
-        existing = res.json()
+        response = await supabase.upsert(TABLE, [row], on_conflict=UNIQUE_KEY)
+        return _response(response)
 
-        if existing:  # update
-            patch_url = f"{url}?name=eq.{profile.name}"
-            response = requests.patch(
-                patch_url,
-                json=profile.dict(),
-                headers={**headers, "Prefer": "return=representation"}  # ✅ 여기 추가
-            )
-        else:  # insert
-            response = requests.post(
-                url,
-                json=[profile.dict()],
-                headers={**headers, "Prefer": "return=representation"}
-            )
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"ok": False, "error": str(e)})
 
-        # 응답 처리
-        if response.status_code >= 400:
-            return JSONResponse(
-                status_code=response.status_code,
-                content={"ok": False, "error": response.text}
-            )
+@router.post("/profile/bulk")
+async def save_profiles_bulk(profiles: List[Profile]):
+    """HR 일괄 등록: 여러 프로필을 upsert 요청 1회로 저장"""
+    try:
+        if not profiles:
+            return {"ok": True, "data": []}
+        if len(profiles) > BULK_MAX:
+            return JSONResponse(status_code=413, content={"ok": False, "error": f"한 번에 최대 {BULK_MAX}건까지 가능합니다."})
 
-        # 응답이 204라면 JSON 없음
-        if response.status_code == 204 or not response.text.strip():
-            return {"ok": True, "data": None}
+        # 같은 키가 여러 번 오면 마지막 값만 사용 (한 upsert 안에서 같은 행을 두 번 갱신할 수 없음)
+        rows: Dict[str, dict] = {}
+        for i, p in enumerate(profiles):
+            row = p.dict()
+            key = row.get(UNIQUE_KEY)
+            if not key:
+                return JSONResponse(status_code=400, content={"ok": False, "error": f"{i}번째 항목에 {UNIQUE_KEY} 값이 필요합니다."})
+            rows[key] = row
 
-        return {"ok": True, "data": response.json()}
+        response = await supabase.upsert(TABLE, list(rows.values()), on_conflict=UNIQUE_KEY)
+        return _response(response)
 
     except Exception as e:
         import traceback
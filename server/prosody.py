@@ -0,0 +1,215 @@
+# server/prosody.py — 발화 전달력(prosody) 특징
+# 16k mono float32 오디오를 블록 단위로 한 번만 훑으며 계산 (메모리 일정, 스트리밍 입력 가능)
+# - 프레임별 RMS 에너지
+# - F0: YIN (유성 프레임만)
+# - 발화 시간 / 말하기 속도
+# - 쉼(pause) 통계
+import math
+import re
+from typing import Dict, Optional
+
+import numpy as np
+
+SR = 16000
+
+
+class ProsodyTracker:
+    """
+    update(chunk) 로 오디오를 순서대로 넣고 summary() 로 결과 조회.
+    프레임 hop_ms 간격, 분석창 win_ms, F0 탐색 범위 fmin~fmax
+    """
+
+    def __init__(self, sr: int = SR, hop_ms: int = 10, win_ms: int = 25,
+                 fmin: float = 70.0, fmax: float = 400.0, yin_threshold: float = 0.15,
+                 silence_rms: float = 0.01, min_pause_ms: int = 250, long_pause_ms: int = 1000,
+                 block_frames: int = 200):
+        self.sr = sr
+        self.hop = sr * hop_ms // 1000
+        self.win = sr * win_ms // 1000
+        self.tau_min = max(2, int(sr / fmax))
+        self.tau_max = int(sr / fmin)
+        self.frame_len = self.win + self.tau_max
+        self.nfft = 1 << (self.frame_len - 1).bit_length()
+        self.yin_threshold = yin_threshold
+        self.silence_rms = silence_rms
+        self.min_pause = max(1, min_pause_ms // hop_ms)
+        self.long_pause = max(1, long_pause_ms // hop_ms)
+        self.block_frames = block_frames
+
+        self._tail = np.zeros(0, dtype=np.float32)
+        self.samples = 0
+        self.frames = 0
+        self.energy_sum = 0.0       # 샘플 제곱합 (전체 평균 에너지)
+        self.rms_sum = 0.0
+        self.speech_frames = 0      # RMS가 임계값 이상인 프레임
+        self.voiced_frames = 0      # 그중 F0가 잡힌 프레임
+        # F0 (Hz) / 반음 단위 Welford
+        self.f0_mean = 0.0
+        self.f0_m2 = 0.0
+        self.st_mean = 0.0
+        self.st_m2 = 0.0
+        self.f0_min = math.inf
+        self.f0_max = 0.0
+        # 쉼: 발화 사이의 무음 구간만 센다 (앞/뒤 무음 제외)
+        self._silent_run = 0
+        self._seen_speech = False
+        self.pause_count = 0
+        self.long_pause_count = 0
+        self.pause_frames = 0
+        self.max_pause_frames = 0
+        self.speech_segments = 0
+
+    # ----------------- 입력 -----------------
+    def update(self, chunk: np.ndarray):
+        chunk = np.asarray(chunk, dtype=np.float32)
+        self.samples += chunk.size
+        self.energy_sum += float(np.dot(chunk, chunk))
+        buf = np.concatenate([self._tail, chunk]) if self._tail.size else chunk
+        if buf.size < self.frame_len:
+            self._tail = buf.copy()
+            return
+        n = (buf.size - self.frame_len) // self.hop + 1
+        windows = np.lib.stride_tricks.sliding_window_view(buf, self.frame_len)[::self.hop][:n]
+        for i in range(0, n, self.block_frames):
+            self._process(windows[i:i + self.block_frames])
+        self._tail = buf[n * self.hop:].copy()
+
+    # ----------------- 프레임 블록 처리 -----------------
+    def _process(self, frames: np.ndarray):
+        head = frames[:, :self.win]
+        rms = np.sqrt(np.mean(head * head, axis=1))
+        f0 = self._yin(frames)
+        speech = rms >= self.silence_rms
+        f0 = np.where(speech, f0, np.nan)
+
+        self.frames += len(frames)
+        self.rms_sum += float(rms.sum())
+        self.speech_frames += int(speech.sum())
+
+        voiced = f0[~np.isnan(f0)]
+        if voiced.size:
+            self._add_f0(voiced)
+
+        for s in speech:
+            self._step_pause(bool(s))
+
+    def _yin(self, frames: np.ndarray) -> np.ndarray:
+        """YIN: 누적 평균 정규화 차분 함수의 첫 임계값 이하 지점 → F0. 못 찾으면 NaN"""
+        W, tmax = self.win, self.tau_max
+        x = frames.astype(np.float64)
+        # r(tau) = Σ x[j]·x[j+tau]  (FFT 상관, j ∈ [0, W))
+        X = np.fft.rfft(x, self.nfft, axis=1)
+        A = np.fft.rfft(x[:, :W], self.nfft, axis=1)
+        r = np.fft.irfft(X * np.conj(A), self.nfft, axis=1)[:, :tmax + 1]
+        # d(tau) = E(0) + E(tau) - 2 r(tau)
+        cs = np.concatenate([np.zeros((len(x), 1)), np.cumsum(x * x, axis=1)], axis=1)
+        taus = np.arange(tmax + 1)
+        e_tau = cs[:, taus + W] - cs[:, taus]
+        d = np.maximum(cs[:, W:W + 1] + e_tau - 2 * r, 0.0)
+        # d'(tau) = d(tau) · tau / Σ_{k≤tau} d(k)
+        cum = np.cumsum(d[:, 1:], axis=1)
+        cmnd = np.ones_like(d)
+        cmnd[:, 1:] = d[:, 1:] * taus[1:] / np.maximum(cum, 1e-12)
+
+        seg = cmnd[:, self.tau_min:]
+        below = seg < self.yin_threshold
+        found = below.any(axis=1)
+        idx = np.argmax(below, axis=1)
+        # 임계값 아래로 내려간 뒤 국소 최소점까지 이동
+        rows = np.arange(len(seg))
+        for _ in range(self.tau_max - self.tau_min):
+            nxt = np.minimum(idx + 1, seg.shape[1] - 1)
+            move = found & (seg[rows, nxt] < seg[rows, idx])
+            if not move.any():
+                break
+            idx = np.where(move, nxt, idx)
+        tau = (idx + self.tau_min).astype(np.float64)
+        # 포물선 보간으로 정밀도 향상
+        t = idx + self.tau_min
+        left, right = cmnd[rows, np.maximum(t - 1, 1)], cmnd[rows, np.minimum(t + 1, tmax)]
+        mid = cmnd[rows, t]
+        denom = left - 2 * mid + right
+        tau += np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / np.where(denom == 0, 1, denom), 0.0)
+        return np.where(found, self.sr / tau, np.nan)
+
+    def _add_f0(self, f0: np.ndarray):
+        # 블록 단위 평균/분산 병합 (Chan 병렬 알고리즘)
+        n_a, n_b = self.voiced_frames, f0.size
+        n = n_a + n_b
+        st = 12.0 * np.log2(f0 / 100.0)  # 100Hz 기준 반음
+        self.f0_mean, self.f0_m2 = _merge_moments(self.f0_mean, self.f0_m2, n_a, f0, n)
+        self.st_mean, self.st_m2 = _merge_moments(self.st_mean, self.st_m2, n_a, st, n)
+        self.voiced_frames = n
+        self.f0_min = min(self.f0_min, float(f0.min()))
+        self.f0_max = max(self.f0_max, float(f0.max()))
+
+    def _step_pause(self, speech: bool):
+        if not speech:
+            self._silent_run += 1
+            return
+        if not self._seen_speech or self._silent_run >= self.min_pause:
+            self.speech_segments += 1
+        if self._seen_speech and self._silent_run >= self.min_pause:
+            self.pause_count += 1
+            self.pause_frames += self._silent_run
+            self.max_pause_frames = max(self.max_pause_frames, self._silent_run)
+            if self._silent_run >= self.long_pause:
+                self.long_pause_count += 1
+        self._seen_speech = True
+        self._silent_run = 0
+
+    # ----------------- 결과 -----------------
+    def summary(self, text: Optional[str] = None) -> Dict:
+        hop_sec = self.hop / self.sr
+        speech_sec = self.speech_frames * hop_sec
+        n = self.voiced_frames
+        out = {
+            "duration_sec": round(self.samples / self.sr, 3),
+            "energy": self.energy_sum / self.samples if self.samples else 0.0,
+            "rms_mean": round(self.rms_sum / self.frames, 5) if self.frames else 0.0,
+            "speech_sec": round(speech_sec, 2),
+            "speech_ratio": round(self.speech_frames / self.frames, 3) if self.frames else 0.0,
+            "voiced_ratio": round(n / self.speech_frames, 3) if self.speech_frames else 0.0,
+            "f0_mean": round(self.f0_mean, 1) if n else 0.0,
+            "f0_std": round(math.sqrt(self.f0_m2 / n), 1) if n > 1 else 0.0,
+            "f0_min": round(self.f0_min, 1) if n else 0.0,
+            "f0_max": round(self.f0_max, 1) if n else 0.0,
+            "f0_semitone_std": round(math.sqrt(self.st_m2 / n), 2) if n > 1 else 0.0,
+            "speech_segments": self.speech_segments,
+            "pause_count": self.pause_count,
+            "long_pause_count": self.long_pause_count,
+            "pause_total_sec": round(self.pause_frames * hop_sec, 2),
+            "pause_mean_sec": round(self.pause_frames * hop_sec / self.pause_count, 2) if self.pause_count else 0.0,
+            "pause_max_sec": round(self.max_pause_frames * hop_sec, 2),
+        }
+        if text is not None:
+            out["speech_rate_sps"] = speaking_rate(text, speech_sec)
+        return out
+
+
+def _merge_moments(mean_a: float, m2_a: float, n_a: int, xs: np.ndarray, n: int):
+    mean_b = float(xs.mean())
+    m2_b = float(((xs - mean_b) ** 2).sum())
+    delta = mean_b - mean_a
+    mean = mean_a + delta * xs.size / n
+    m2 = m2_a + m2_b + delta * delta * n_a * xs.size / n
+    return mean, m2
+
+
+_SYLLABLE_RE = re.compile(r"[가-힣]|[A-Za-z]+|\d")
+
+
+def speaking_rate(text: str, speech_sec: float) -> float:
+    """말하기 속도: 발화 시간(무음 제외) 1초당 음절 수 (한글 1글자 = 1음절, 영단어/숫자는 1개로 계산)"""
+    if speech_sec <= 0:
+        return 0.0
+    return round(len(_SYLLABLE_RE.findall(text or "")) / speech_sec, 2)
+
+
+def analyze_prosody(y: np.ndarray, sr: int = SR, text: Optional[str] = None, block_sec: float = 1.0) -> Dict:
+    """배열 전체를 block_sec 단위로 나눠 한 번에 훑음 (블록 크기만큼의 추가 메모리만 사용)"""
+    tracker = ProsodyTracker(sr=sr)
+    step = int(block_sec * sr)
+    for i in range(0, y.size, step):
+        tracker.update(y[i:i + step])
+    return tracker.summary(text)
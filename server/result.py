@@ -1,10 +1,31 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
 
+from server.camera_session import get_session
+
 router = APIRouter()
 
 @router.get("/result")
-def get_result():
+def get_result(session: Optional[str] = Query(None)):
+    # 카메라 세션 id가 오면 서버에서 누적한 실제 통계로 응답 (프레임 재계산 없음)
+    if session:
+        st = get_session(session)
+        if st is None:
+            return JSONResponse({"ok": False, "error": "SESSION_NOT_FOUND"}, status_code=404)
+        scores = st.scores()
+        return JSONResponse({
+            "ok": True,
+            "overallScore": scores["overall"],
+            "detailFeedback": {
+                "direction": scores["direction"],
+                "eye": scores["gaze"],
+                "smile": scores["smile"],
+            },
+            "camera": st.summary(),
+        })
+
     return JSONResponse({
         "ok": True,
         "overallScore": 83,
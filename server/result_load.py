@@ -1,81 +1,211 @@
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
 import os
-import requests
-from dotenv import load_dotenv
-from typing import Optional
-from urllib.parse import urlencode
+import time
 
-# .env 로드
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+import httpx
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")  # https://xxxx.supabase.co
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # Service Role Key
-
-# URL 정리 (마지막 슬래시 제거)
-if SUPABASE_URL and SUPABASE_URL.endswith('/'):
-    SUPABASE_URL = SUPABASE_URL.rstrip('/')
+from server.supabase_rest import supabase, SupabaseNotConfigured
 
 router = APIRouter()
 
+TABLE = "results_log"
+
+# 목록용 projection: 카드에 표시하는 값만 (answers 같은 큰 JSON 제외)
+LIST_SELECT = ",".join([
+    "id", "email", "created_at",
+    "overallScore:result->overallScore",
+    "detailFeedback:result->detailFeedback",
+    "postureFeedback:result->postureFeedback",
+    "feedback:result->feedback",
+    "duration:result->duration",
+    "timestamp:result->>timestamp",
+    "name:result->interviewData->>name",
+    "company:result->interviewData->>company",
+    "role:result->interviewData->>role",
+])
+DETAIL_SELECT = "id,email,created_at,result"
+
+# 사용자별 짧은 TTL 서버 캐시 (브라우저는 매번 ETag 로 재검증 → 304)
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "30"))
+RESULT_CACHE_MAX = int(os.getenv("RESULT_CACHE_MAX", "1024"))
+_CACHE: "OrderedDict[Tuple, Tuple[float, str, bytes]]" = OrderedDict()
+
+
+# ----------------- 캐시 -----------------
+def _cache_get(key: Tuple) -> Optional[Tuple[str, bytes]]:
+    rec = _CACHE.get(key)
+    if not rec:
+        return None
+    ts, etag, body = rec
+    if time.time() - ts > RESULT_CACHE_TTL:
+        _CACHE.pop(key, None)
+        return None
+    _CACHE.move_to_end(key)
+    return etag, body
+
+def _cache_set(key: Tuple, content: Dict[str, Any]) -> Tuple[str, bytes]:
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    _CACHE[key] = (time.time(), etag, body)
+    _CACHE.move_to_end(key)
+    while len(_CACHE) > RESULT_CACHE_MAX:
+        _CACHE.popitem(last=False)
+    return etag, body
+
+def invalidate_results_cache(email: Optional[str] = None):
+    """새 결과 저장 시 호출: 해당 사용자 + 이름 검색 목록 캐시 제거 (email 없으면 목록 전체)"""
+    for key in list(_CACHE.keys()):
+        if key[0] == "list" and (email is None or key[1] in (email, None)):
+            _CACHE.pop(key, None)
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    # If-None-Match: "*" 또는 쉼표로 구분된 ETag 목록, 약한 비교(W/ 접두어 무시) — 프록시/gzip 이 W/ 를 붙이는 경우 대비
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+def _cached_response(request: Request, etag: str, body: bytes) -> Response:
+    # no-cache: 브라우저가 재사용 전에 항상 서버에 확인 → 저장 직후 invalidate 가 바로 반영
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# ----------------- 커서 (created_at|id) -----------------
+def _encode_cursor(row: Dict[str, Any]) -> str:
+    return f"{row['created_at']}|{row['id']}"
+
+def _cursor_filter(cursor: str) -> str:
+    # created_at 내림차순 + 같은 시각은 id 내림차순 → (created_at, id) 보다 작은 행
+    created_at, _, row_id = cursor.partition("|")
+    if not row_id:
+        return f'(created_at.lt."{created_at}")'
+    return f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{row_id}"))'
+
+def _to_list_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    # 프론트 카드가 쓰는 result 구조로 맞춤
+    return {
+        "id": row.get("id"),
+        "email": row.get("email"),
+        "created_at": row.get("created_at"),
+        "result": {
+            "overallScore": row.get("overallScore"),
+            "detailFeedback": row.get("detailFeedback"),
+            "postureFeedback": row.get("postureFeedback"),
+            "feedback": row.get("feedback"),
+            "duration": row.get("duration"),
+            "timestamp": row.get("timestamp"),
+            "interviewData": {
+                "name": row.get("name"),
+                "company": row.get("company"),
+                "role": row.get("role"),
+            },
+        },
+    }
+
+def _error_message(res: httpx.Response) -> str:
+    if res.status_code == 401:
+        return "Supabase 인증 오류. API 키를 확인해주세요."
+    if res.status_code == 404:
+        return "테이블을 찾을 수 없습니다. 테이블명을 확인해주세요."
+    return f"API 호출 실패 (상태코드: {res.status_code}): {res.text[:200]}"
+
+
+# ----------------- 라우트 -----------------
 @router.get("/result_load")
-async def load_results(email: Optional[str] = Query(None), name: Optional[str] = Query(None)):
+async def load_results(
+    request: Request,
+    email: Optional[str] = Query(None),
+    name: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+):
+    """
+    면접 기록 목록 (최신순, keyset 페이지네이션)
+    - 목록은 가벼운 projection 만 반환 → 전체 결과는 /result_load/{id}
+    - 다음 페이지: next_cursor 를 cursor 로 전달
+    """
     try:
-        # 환경변수 확인
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            return {"status": "error", "message": "Supabase 환경변수가 설정되지 않았습니다."}
-        
-        # Supabase REST API URL
-        url = f"{SUPABASE_URL}/rest/v1/results_log"
-        
-        # 헤더 설정 (Supabase 공식 문서 기준)
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation"
-        }
-        
+        key = ("list", email, None if email else name, limit, cursor)
+        hit = _cache_get(key)
+        if hit:
+            return _cached_response(request, *hit)
+
         # 쿼리 파라미터 구성 (딕셔너리 형태)
         params = {
-            "select": "id,email,created_at,result",
-            "order": "created_at.desc"
+            "select": LIST_SELECT,
+            "order": "created_at.desc,id.desc",
+            "limit": limit + 1,  # 1개 더 받아서 다음 페이지 여부 확인
         }
-        
+
         # 필터 조건 추가
         # 이메일 검색 (정확히 일치)
         if email:
             params["email"] = f"eq.{email}"
-        
+
         # 이름 검색 (JSON 필드 검색) - 이메일 검색이 있으면 무시
         if name and not email:
-            params["result->interviewData->name"] = f"eq.{name}"
-        
-        print(f"요청 파라미터: {params}")
-        
-        # requests.get을 사용해 자동으로 URL 인코딩
-        res = requests.get(url, headers=headers, params=params)
-        
-        print(f"응답 상태 코드: {res.status_code}")
-        print(f"응답 헤더: {res.headers}")
-        print(f"응답 텍스트: {res.text[:500]}...")  # 처음 500자만 출력
-        
-        if res.status_code == 200:
-            try:
-                data = res.json()
-                return {"status": "success", "data": data}
-            except Exception as json_error:
-                return {"status": "error", "message": f"JSON 파싱 오류: {str(json_error)}, 응답: {res.text[:200]}"}
-        elif res.status_code == 401:
-            return {"status": "error", "message": "Supabase 인증 오류. API 키를 확인해주세요."}
-        elif res.status_code == 404:
-            return {"status": "error", "message": "테이블을 찾을 수 없습니다. 테이블명을 확인해주세요."}
-        else:
-            return {"status": "error", "message": f"API 호출 실패 (상태코드: {res.status_code}): {res.text}"}
-            
-    except requests.exceptions.RequestException as req_error:
+            params["result->interviewData->>name"] = f"eq.{name}"
+
+        if cursor:
+            params["or"] = _cursor_filter(cursor)
+
+        # 공용 클라이언트 (params 는 자동 URL 인코딩)
+        res = await supabase.select(TABLE, params)
+        if res.status_code != 200:
+            print(f"결과 목록 조회 실패: {res.status_code}")
+            return {"status": "error", "message": _error_message(res)}
+
+        rows = res.json()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        content = {
+            "status": "success",
+            "data": [_to_list_item(r) for r in rows],
+            "next_cursor": _encode_cursor(rows[-1]) if has_more and rows else None,
+        }
+        return _cached_response(request, *_cache_set(key, content))
+
+    except SupabaseNotConfigured:
+        return {"status": "error", "message": "Supabase 환경변수가 설정되지 않았습니다."}
+    except httpx.HTTPError as req_error:
+        print(f"요청 오류: {str(req_error)}")
+        return {"status": "error", "message": f"네트워크 오류: {str(req_error)}"}
+    except Exception as e:
+        print(f"예외 발생: {str(e)}")
+        return {"status": "error", "message": f"서버 오류: {str(e)}"}
+
+@router.get("/result_load/{result_id}")
+async def load_result_detail(request: Request, result_id: str):
+    """면접 기록 1건 전체 (answers/feedback 포함)"""
+    try:
+        key = ("detail", None, result_id)
+        hit = _cache_get(key)
+        if hit:
+            return _cached_response(request, *hit)
+
+        res = await supabase.select(TABLE, {"select": DETAIL_SELECT, "id": f"eq.{result_id}", "limit": 1})
+        if res.status_code != 200:
+            print(f"결과 상세 조회 실패: {res.status_code}")
+            return {"status": "error", "message": _error_message(res)}
+
+        rows = res.json()
+        if not rows:
+            return JSONResponse(status_code=404, content={"status": "error", "message": "기록을 찾을 수 없습니다."})
+        return _cached_response(request, *_cache_set(key, {"status": "success", "data": rows[0]}))
+
+    except SupabaseNotConfigured:
+        return {"status": "error", "message": "Supabase 환경변수가 설정되지 않았습니다."}
+    except httpx.HTTPError as req_error:
         print(f"요청 오류: {str(req_error)}")
         return {"status": "error", "message": f"네트워크 오류: {str(req_error)}"}
     except Exception as e:
         print(f"예외 발생: {str(e)}")
-        return {"status": "error", "message": f"서버 오류: {str(e)}"}
\ No newline at end of file
+        return {"status": "error", "message": f"서버 오류: {str(e)}"}
@@ -0,0 +1,332 @@
+# server/result_queue.py — 면접 결과 write-behind 저장
+# /api/result_save 는 로컬 SQLite(WAL) 큐에 기록만 하고 바로 응답 → 백그라운드 flusher 가 묶어서 Supabase 에 bulk insert
+# 서버가 재시작돼도 큐에 남은 결과는 다음 시작 때 다시 전송됨
+# 각 행은 client_id(uuid)를 갖고 on_conflict=client_id + ignore-duplicates 로 전송
+# → 응답을 못 받은 배치를 다시 보내도 중복 저장되지 않음 (results_log.client_id 에 unique 제약 필요)
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from server.supabase_rest import supabase
+
+logger = logging.getLogger(__name__)
+
+# 1이면 write-behind 사용, 0이면 기존처럼 요청마다 바로 insert
+RESULT_WRITE_BEHIND = os.getenv("RESULT_WRITE_BEHIND", "0") == "1"
+RESULT_QUEUE_PATH = os.getenv("RESULT_QUEUE_PATH", os.path.join("data", "result_queue.db"))
+# 한 번에 보낼 최대 행 수 / 최대 대기 시간(ms)
+RESULT_FLUSH_BATCH = int(os.getenv("RESULT_FLUSH_BATCH", "100"))
+RESULT_FLUSH_MS = int(os.getenv("RESULT_FLUSH_MS", "500"))
+# 행 단위 전송 실패가 이 횟수를 넘으면 보류(failed) 처리 → 큐를 막지 않음
+RESULT_FLUSH_MAX_ATTEMPTS = int(os.getenv("RESULT_FLUSH_MAX_ATTEMPTS", "5"))
+
+TABLE = "results_log"
+CLIENT_ID_COLUMN = "client_id"
+# 행이 아니라 테이블 설정 문제인 오류 (unique 제약 없음 / 컬럼·테이블 없음) → 행 실패로 세지 않고 배치째 재시도
+SCHEMA_ERROR_CODES = {"42P10", "42703", "42P01", "PGRST204", "PGRST205"}
+
+
+class ResultQueueSchemaError(RuntimeError):
+    pass
+
+
+def _schema_error(res: httpx.Response) -> Optional[str]:
+    if not (400 <= res.status_code < 500):
+        return None
+    try:
+        code = (res.json() or {}).get("code")
+    except (ValueError, AttributeError):
+        return None
+    if code in SCHEMA_ERROR_CODES:
+        return f"{code}: {res.text[:300]}"
+    return None
+
+
+class ResultWriteBehind:
+    """
+    SQLite(WAL) 기반 내구성 큐 + 배치 flusher.
+    - enqueue(): 커밋까지 끝나면 반환 (응답 후 프로세스가 죽어도 유실 없음)
+    - flusher: RESULT_FLUSH_BATCH 개가 모이거나 RESULT_FLUSH_MS 가 지나면 전송
+    - 전송 실패(네트워크/5xx): 지수 백오프 후 같은 배치 재시도 (client_id 로 중복 무시)
+    - 4xx 로 배치가 거부되면 행 단위로 나눠 보내 문제 행만 골라냄 (테이블 설정 오류는 행 탓이 아니므로 제외)
+    - 보류(failed)된 행은 requeue_failed() 로 다시 대기열에 넣음
+    """
+
+    def __init__(self, path: str = RESULT_QUEUE_PATH, batch: int = RESULT_FLUSH_BATCH,
+                 interval_ms: int = RESULT_FLUSH_MS, max_attempts: int = RESULT_FLUSH_MAX_ATTEMPTS):
+        self.path = path
+        self.batch = batch
+        self.interval = interval_ms / 1000
+        self.max_attempts = max_attempts
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._queued = 0  # 아직 전송 안 된 행 수(대략) — 배치가 찼는지 판단용
+        self._flushed = 0
+        self._batches = 0
+        self._errors = 0
+        self._last_flush_at: Optional[float] = None
+        self._schema_error: Optional[str] = None  # 마지막 테이블 설정 오류 (해결되면 None)
+
+    # ----------------- SQLite -----------------
+    def _open(self):
+        if self._db is not None:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        # FULL: 커밋마다 WAL 을 fsync → enqueue 가 반환된 결과는 전원이 나가도 유지 (NORMAL 은 마지막 커밋들이 유실될 수 있음)
+        db.execute("PRAGMA synchronous=FULL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS pending ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " email TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " client_id TEXT)"
+        )
+        # 이전 버전 큐 파일: client_id 컬럼 추가 후 남은 행에 채움
+        columns = {r[1] for r in db.execute("PRAGMA table_info(pending)").fetchall()}
+        if "client_id" not in columns:
+            db.execute("ALTER TABLE pending ADD COLUMN client_id TEXT")
+        db.execute("UPDATE pending SET client_id = lower(hex(randomblob(16))) WHERE client_id IS NULL")
+        self._db = db
+
+    def _execute(self, sql: str, args=()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def _insert(self, email: str, result: Dict[str, Any]) -> int:
+        body = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO pending (email, result, created_at, client_id) VALUES (?, ?, ?, ?)",
+                (email, body, time.time(), uuid.uuid4().hex),
+            )
+            return cur.lastrowid
+
+    def _next_batch(self) -> List[tuple]:
+        return self._execute(
+            "SELECT id, email, result, client_id FROM pending WHERE attempts < ? ORDER BY id LIMIT ?",
+            (self.max_attempts, self.batch),
+        )
+
+    def _delete(self, ids: List[int]):
+        with self._lock:
+            self._db.executemany("DELETE FROM pending WHERE id = ?", [(i,) for i in ids])
+
+    def _mark_failed(self, row_id: int, error: str):
+        self._execute(
+            "UPDATE pending SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+            (error[:500], row_id),
+        )
+
+    def _reset_failed(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "UPDATE pending SET attempts = 0 WHERE attempts >= ?", (self.max_attempts,)
+            ).rowcount
+
+    def _counts(self) -> Dict[str, int]:
+        pending, failed = self._execute(
+            "SELECT COALESCE(SUM(attempts < ?), 0), COALESCE(SUM(attempts >= ?), 0) FROM pending",
+            (self.max_attempts, self.max_attempts),
+        )[0]
+        return {"pending": int(pending), "failed": int(failed)}
+
+    # ----------------- 수명주기 -----------------
+    async def check_table(self):
+        """
+        시작 시 1회: 빈 배열을 on_conflict=client_id 로 upsert → unique 제약/컬럼이 없으면 바로 실패
+        (없는 채로 돌면 모든 전송이 거부되는데 /result_save 는 이미 성공을 응답한 뒤라 알아채기 어려움)
+        네트워크 오류 등 확인 자체가 안 되면 경고만 남기고 진행
+        """
+        try:
+            res = await self._send([])
+        except Exception as e:
+            logger.warning(f"results_log 설정 확인 실패 ({e}), 전송 시 다시 확인")
+            return
+        error = _schema_error(res)
+        if error or (400 <= res.status_code < 500 and res.status_code != 429):
+            self._schema_error = error or f"{res.status_code}: {res.text[:300]}"
+            raise ResultQueueSchemaError(
+                f"RESULT_WRITE_BEHIND=1 에는 {TABLE}.{CLIENT_ID_COLUMN} 컬럼 + unique 제약이 필요합니다 ({self._schema_error})"
+            )
+
+    async def start(self):
+        if self._task is not None:
+            return
+        await self.check_table()
+        await asyncio.to_thread(self._open)
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        counts = await asyncio.to_thread(self._counts)
+        self._queued = counts["pending"]
+        if counts["failed"]:
+            logger.warning(f"전송 보류된 결과 {counts['failed']}건 (POST /api/result_save/requeue 로 재전송)")
+        if self._queued:
+            # 지난 실행에서 못 보낸 결과 재전송
+            logger.info(f"미전송 결과 {self._queued}건 재전송 시작")
+            self._wakeup.set()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # 종료 전에 남은 큐를 한 번 더 비움 (실패하면 다음 시작 때 재전송)
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=10)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def requeue_failed(self) -> int:
+        """보류(failed)된 행의 시도 횟수를 초기화해 다시 전송 대상으로 (테이블 설정을 고친 뒤 등)"""
+        if self._db is None:
+            await self.start()
+        count = await asyncio.to_thread(self._reset_failed)
+        if count:
+            self._queued += count
+            self._wakeup.set()
+        return count
+
+    async def enqueue(self, email: str, result: Dict[str, Any]) -> int:
+        if self._db is None:
+            await self.start()
+        row_id = await asyncio.to_thread(self._insert, email, result)
+        self._queued += 1
+        if self._queued >= self.batch:
+            self._wakeup.set()
+        return row_id
+
+    # ----------------- flusher -----------------
+    async def _run(self):
+        backoff = 0.5
+        while True:
+            # RESULT_FLUSH_MS 마다 전송, 그 전에 배치가 차면 바로 전송
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._queued and not self._stopping:
+                continue
+            try:
+                while True:
+                    # 거부된 행은 _queued 에 남겨 다음 주기에 다시 시도 (attempts 한도까지)
+                    sent = await self._flush_once()
+                    self._queued = max(0, self._queued - sent)
+                    if sent < self.batch:
+                        break
+                backoff = 0.5
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"결과 일괄 저장 실패 ({e}), {backoff:.1f}초 후 재시도")
+                if self._stopping:
+                    return
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                self._wakeup.set()
+                continue
+            if self._stopping:
+                return
+
+    @staticmethod
+    def _payload(row: tuple) -> Dict[str, Any]:
+        _, email, body, client_id = row
+        return {"email": email, "result": json.loads(body), CLIENT_ID_COLUMN: client_id}
+
+    async def _send(self, payload: Any) -> httpx.Response:
+        # 같은 client_id 가 이미 저장돼 있으면 건너뜀 (멱등 → 타임아웃/5xx 도 안전하게 재시도)
+        return await supabase.upsert(TABLE, payload, on_conflict=CLIENT_ID_COLUMN,
+                                     returning="minimal", resolution="ignore-duplicates")
+
+    async def _flush_once(self) -> int:
+        """배치 하나 전송 → 저장(큐에서 삭제)된 행 수. 거부된 행은 attempts 만 올리고 큐에 남음"""
+        rows = await asyncio.to_thread(self._next_batch)
+        if not rows:
+            self._queued = 0  # 보낼 행 없음 (남은 건 보류된 행뿐)
+            return 0
+        res = await self._send([self._payload(r) for r in rows])
+        if res.is_success:
+            self._schema_error = None
+            await asyncio.to_thread(self._delete, [r[0] for r in rows])
+            self._after_flush(rows)
+            return len(rows)
+        self._raise_if_schema_error(res)
+        if 400 <= res.status_code < 500 and res.status_code != 429:
+            # 배치 안의 잘못된 행 때문일 수 있음 → 한 행씩 보내서 분리
+            return await self._flush_rows(rows)
+        raise httpx.HTTPStatusError(f"status {res.status_code}: {res.text[:200]}", request=res.request, response=res)
+
+    async def _flush_rows(self, rows: List[tuple]) -> int:
+        done = []
+        for row in rows:
+            res = await self._send(self._payload(row))
+            if res.is_success:
+                done.append(row)
+                continue
+            if _schema_error(res):
+                # 행 문제가 아님 → 지금까지 저장된 행만 정리하고 배치째 재시도
+                break
+            logger.error(f"결과 저장 거부 (id={row[0]}): {res.status_code} {res.text[:200]}")
+            await asyncio.to_thread(self._mark_failed, row[0], f"{res.status_code} {res.text}")
+        if done:
+            await asyncio.to_thread(self._delete, [r[0] for r in done])
+            self._after_flush(done)
+        self._raise_if_schema_error(res)
+        return len(done)
+
+    def _raise_if_schema_error(self, res: httpx.Response):
+        error = _schema_error(res)
+        if error:
+            self._schema_error = error
+            logger.error(f"{TABLE} 설정 오류로 결과 전송 불가 (큐에 보관, 재시도): {error}")
+            raise ResultQueueSchemaError(error)
+
+    def _after_flush(self, rows: List[tuple]):
+        from server.result_load import invalidate_results_cache
+        self._flushed += len(rows)
+        self._batches += 1
+        self._last_flush_at = time.time()
+        for email in {r[1] for r in rows}:
+            invalidate_results_cache(email)
+
+    async def metrics(self) -> Dict[str, Any]:
+        counts = await asyncio.to_thread(self._counts) if self._db is not None else {"pending": 0, "failed": 0}
+        return {
+            "ok": True,
+            "enabled": RESULT_WRITE_BEHIND,
+            **counts,
+            "flushed": self._flushed,
+            "batches": self._batches,
+            "errors": self._errors,
+            "schema_error": self._schema_error,
+            "last_flush_at": self._last_flush_at,
+            "batch_size": self.batch,
+            "interval_ms": int(self.interval * 1000),
+        }
+
+
+# 앱 전체가 공유하는 인스턴스 (RESULT_WRITE_BEHIND=1 일 때 app.py lifespan 에서 start/stop)
+result_queue = ResultWriteBehind()
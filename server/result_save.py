@@ -1,15 +1,9 @@
-from fastapi import FastAPI, APIRouter
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import APIRouter
 from pydantic import BaseModel
-import os
-import requests
-from dotenv import load_dotenv
 
-# .env 로드
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")  # https://xxxx.supabase.co
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # Service Role Key
+from server.supabase_rest import supabase
+from server.result_load import invalidate_results_cache
+from server.result_queue import result_queue, RESULT_WRITE_BEHIND
 
 router = APIRouter()
 
@@ -21,22 +15,35 @@ class SaveRequest(BaseModel):
 @router.post("/result_save")
 async def save_result(data: SaveRequest):
     try:
-        url = f"{SUPABASE_URL}/rest/v1/results_log"
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-            "Prefer": "return=minimal"  # insert 후 데이터 반환 생략
-        }
+        if RESULT_WRITE_BEHIND:
+            # 로컬 큐에 기록되면 바로 응답 → Supabase 전송은 백그라운드 배치
+            queue_id = await result_queue.enqueue(data.email, data.result)
+            return {"status": "success", "queued": True, "queue_id": queue_id}
+
         payload = {
             "email": data.email,
             "result": data.result
         }
-        res = requests.post(url, headers=headers, json=payload)
+        # insert 후 데이터 반환 생략 (return=minimal)
+        res = await supabase.insert("results_log", payload)
 
         if res.status_code in [200, 201]:
+            # 해당 사용자의 기록 목록 캐시 무효화
+            invalidate_results_cache(data.email)
             return {"status": "success"}
         else:
             return {"status": "error", "message": res.text}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+@router.get("/result_save/metrics")
+async def result_save_metrics():
+    # write-behind 큐 상태 (대기/보류 건수, 전송 배치 수)
+    return await result_queue.metrics()
+
+@router.post("/result_save/requeue")
+async def result_save_requeue():
+    # 보류(failed)된 결과를 다시 전송 대기열로 (results_log 설정을 고친 뒤 등)
+    if not RESULT_WRITE_BEHIND:
+        return {"ok": False, "error": "WRITE_BEHIND_DISABLED"}
+    return {"ok": True, "requeued": await result_queue.requeue_failed()}
@@ -0,0 +1,232 @@
+# server/stt_stream.py — 실시간(스트리밍) 음성 인식 WebSocket
+# 브라우저 MediaRecorder(timeslice) 조각 → ffmpeg 파이프로 16k mono float32 디코딩 → 링 버퍼
+# → 에너지 기반 VAD로 발화 구간 분리 → 구간별 Whisper 추론 → partial/final 자막 전송
+import os
+import asyncio
+import logging
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from server.voice import analyze_jobs, transcribe_array
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+SR = 16000
+VAD_FRAME = 480  # 30ms
+# 발화 판단 RMS 임계값 / 발화 종료로 볼 무음 길이 / 발화 앞쪽 여유
+STT_VAD_RMS = float(os.getenv("STT_VAD_RMS", "0.01"))
+STT_VAD_SILENCE_MS = int(os.getenv("STT_VAD_SILENCE_MS", "700"))
+STT_VAD_PREROLL_MS = 200
+# 진행 중 발화의 중간 자막 주기 / 한 구간 최대 길이(넘으면 강제로 끊어서 확정)
+STT_PARTIAL_INTERVAL_MS = int(os.getenv("STT_PARTIAL_INTERVAL_MS", "1500"))
+STT_MAX_SEGMENT_SEC = float(os.getenv("STT_MAX_SEGMENT_SEC", "20"))
+# 모든 세션을 합쳐 동시에 돌릴 중간 자막 추론 수 (확정 자막은 제한 없음)
+STT_PARTIAL_MAX = int(os.getenv("STT_PARTIAL_MAX", "1"))
+_partials_running = 0
+
+
+def _partial_allowed() -> bool:
+    # 중간 자막은 여유가 있을 때만: 업로드 분석 작업이 밀려 있거나 워커가 모두 사용 중이면 건너뜀
+    return _partials_running < STT_PARTIAL_MAX and not analyze_jobs.busy()
+
+
+class AudioRingBuffer:
+    """고정 크기 float32 링 버퍼. 위치는 스트림 시작부터의 절대 샘플 번호로 다룸"""
+
+    def __init__(self, seconds: float):
+        self.buf = np.zeros(int(seconds * SR), dtype=np.float32)
+        self.total = 0  # 지금까지 들어온 샘플 수
+
+    def append(self, x: np.ndarray):
+        cap = self.buf.size
+        if x.size > cap:
+            self.total += x.size - cap
+            x = x[-cap:]
+        pos = self.total % cap
+        first = min(cap - pos, x.size)
+        self.buf[pos:pos + first] = x[:first]
+        self.buf[:x.size - first] = x[first:]
+        self.total += x.size
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        cap = self.buf.size
+        start = max(start, self.total - cap, 0)
+        end = min(end, self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        n, s = end - start, start % cap
+        if s + n <= cap:
+            return self.buf[s:s + n].copy()
+        return np.concatenate([self.buf[s:], self.buf[:n - (cap - s)]])
+
+
+class StreamingTranscriber:
+    """세션 1개의 VAD 상태 + 순차 추론 큐"""
+
+    def __init__(self, websocket: WebSocket):
+        self.ws = websocket
+        self.ring = AudioRingBuffer(STT_MAX_SEGMENT_SEC + 5)
+        self.vad_pos = 0                    # VAD가 처리한 위치(절대 샘플)
+        self.seg_start: Optional[int] = None
+        self.last_voice = 0
+        self.last_partial = 0
+        self.finals: List[str] = []
+        # ("partial" | "final", 시작 샘플, 오디오) / None = 종료
+        self.pending: asyncio.Queue = asyncio.Queue()
+        self._partial_queued = False
+        self._finals_pending = 0  # 아직 추론 안 된 확정 구간 수
+
+    def feed(self, samples: np.ndarray):
+        self.ring.append(samples)
+        silence = STT_VAD_SILENCE_MS * SR // 1000
+        max_seg = int(STT_MAX_SEGMENT_SEC * SR)
+        partial_every = STT_PARTIAL_INTERVAL_MS * SR // 1000
+
+        while self.vad_pos + VAD_FRAME <= self.ring.total:
+            frame = self.ring.read(self.vad_pos, self.vad_pos + VAD_FRAME)
+            self.vad_pos += VAD_FRAME
+            if float(np.sqrt(np.mean(frame * frame))) >= STT_VAD_RMS:
+                if self.seg_start is None:
+                    self.seg_start = max(0, self.vad_pos - VAD_FRAME - STT_VAD_PREROLL_MS * SR // 1000)
+                    self.last_partial = self.vad_pos
+                self.last_voice = self.vad_pos
+
+            if self.seg_start is None:
+                continue
+            if self.vad_pos - self.last_voice >= silence:
+                self._finalize(self.last_voice + VAD_FRAME)
+            elif self.vad_pos - self.seg_start >= max_seg:
+                self._finalize(self.vad_pos)
+            elif (self.vad_pos - self.last_partial >= partial_every
+                  and not self._partial_queued and not self._finals_pending):
+                # 추론이 밀려 있으면(중간 자막 대기 중 / 확정 구간 대기 중) 중간 자막은 건너뜀 (확정 자막만 보장)
+                self.last_partial = self.vad_pos
+                self._partial_queued = True
+                self.pending.put_nowait(("partial", self.seg_start, self.ring.read(self.seg_start, self.vad_pos)))
+
+    def flush(self):
+        # 스트림 종료: 진행 중인 발화를 확정하고 종료 표시
+        if self.seg_start is not None:
+            self._finalize(self.ring.total)
+        self.pending.put_nowait(None)
+
+    def _finalize(self, end: int):
+        self._finals_pending += 1
+        self.pending.put_nowait(("final", self.seg_start, self.ring.read(self.seg_start, end)))
+        self.seg_start = None
+
+    async def run_transcriber(self):
+        global _partials_running
+        while True:
+            item = await self.pending.get()
+            if item is None:
+                await self.ws.send_json({"type": "done", "text": " ".join(self.finals)})
+                return
+            kind, start, audio = item
+            partial = kind == "partial"
+            try:
+                if audio.size < VAD_FRAME * 5 or (partial and not _partial_allowed()):
+                    continue
+                prompt = " ".join(self.finals)[-200:] or None
+                if partial:
+                    _partials_running += 1
+                try:
+                    # 업로드 분석과 같은 STT 스레드 풀 사용 → 세션 수가 늘어도 동시 추론은 STT_WORKERS 개로 제한
+                    text = await analyze_jobs.run(
+                        transcribe_array, audio, initial_prompt=prompt, condition_on_previous_text=False
+                    )
+                finally:
+                    if partial:
+                        _partials_running -= 1
+            except Exception as e:
+                logger.error(f"스트리밍 STT 추론 실패: {e}")
+                await self.ws.send_json({"type": "error", "error": str(e)})
+                continue
+            finally:
+                if partial:
+                    self._partial_queued = False
+                else:
+                    self._finals_pending -= 1
+            if kind == "final" and text:
+                self.finals.append(text)
+            await self.ws.send_json({"type": kind, "text": text, "start": round(start / SR, 2)})
+
+
+async def _pump_decoder(proc, session: StreamingTranscriber):
+    # ffmpeg stdout(f32le) → 링 버퍼. float 경계에 걸친 바이트는 다음 읽기로 넘김
+    rest = b""
+    while True:
+        chunk = await proc.stdout.read(16384)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        usable = len(chunk) - len(chunk) % 4
+        rest = chunk[usable:]
+        if usable:
+            session.feed(np.frombuffer(chunk[:usable], dtype=np.float32))
+    session.flush()
+
+
+@router.websocket("/stt/ws")
+async def stt_ws(websocket: WebSocket):
+    """
+    업스트림: MediaRecorder(audio/webm) timeslice 조각(binary), 녹음이 끝나면 텍스트 "end"
+    다운스트림: {"type": "partial"|"final", "text", "start"} … 마지막에 {"type": "done", "text": 전체}
+    """
+    await websocket.accept()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            # 입력 분석을 최소화해야 첫 조각부터 바로 PCM이 나옴
+            "-probesize", "32768", "-analyzeduration", "0", "-fflags", "nobuffer",
+            "-i", "pipe:0", "-f", "f32le", "-ac", "1", "-ar", str(SR), "-flush_packets", "1", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        logger.error(f"ffmpeg 실행 실패: {e}")
+        await websocket.send_json({"type": "error", "error": f"ffmpeg 실행 실패: {e}"})
+        await websocket.close(code=1011)
+        return
+    session = StreamingTranscriber(websocket)
+    pump = asyncio.create_task(_pump_decoder(proc, session))
+    transcriber = asyncio.create_task(session.run_transcriber())
+    try:
+        while True:
+            msg = await websocket.receive()
+            if msg["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(msg.get("code", 1000))
+            if msg.get("bytes"):
+                proc.stdin.write(msg["bytes"])
+                await proc.stdin.drain()
+            elif msg.get("text") == "end":
+                break
+        # 남은 오디오를 모두 디코딩/추론한 뒤 done 전송
+        proc.stdin.close()
+        await pump
+        await transcriber
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("STT WebSocket 연결 종료")
+    except (BrokenPipeError, ConnectionResetError) as e:
+        # ffmpeg 가 먼저 종료됨 (지원하지 않는 컨테이너/코덱 등) → 오류 알리고 정리
+        logger.warning(f"ffmpeg 디코더 종료: {e}")
+        try:
+            await websocket.send_json({"type": "error", "error": "오디오 디코딩 실패 (지원하지 않는 형식)"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        for t in (pump, transcriber):
+            t.cancel()
+        await asyncio.gather(pump, transcriber, return_exceptions=True)
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass  # 이미 종료됨
+        await proc.wait()
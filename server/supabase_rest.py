@@ -0,0 +1,130 @@
+# server/supabase_rest.py — 공용 비동기 Supabase(PostgREST) 클라이언트
+# 앱 시작 시 httpx.AsyncClient 하나를 만들고 종료 시 닫음 → 모든 라우터가 keep-alive 연결 풀을 공유
+# 요청마다 새 TLS 연결을 열거나 이벤트 루프를 막지 않음
+import os
+import random
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+# .env 로드 (프로젝트 루트)
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+logger = logging.getLogger(__name__)
+
+# 연결 풀 / 타임아웃 / 재시도 설정
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+SUPABASE_RETRIES = int(os.getenv("SUPABASE_RETRIES", "3"))
+SUPABASE_BACKOFF = float(os.getenv("SUPABASE_BACKOFF", "0.2"))  # 첫 재시도 대기(초), 이후 2배씩
+
+# 재시도할 응답 코드 (일시적 오류)
+RETRY_STATUS = {429, 502, 503, 504}
+# 같은 요청을 다시 보내도 결과가 같은 메서드
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+
+class SupabaseNotConfigured(RuntimeError):
+    pass
+
+
+class SupabaseRest:
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        if self._client is not None:
+            return
+        url = (os.getenv("SUPABASE_URL") or "").rstrip("/")  # https://xxxx.supabase.co
+        key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or ""   # Service Role Key (서버 전용)
+        if not url or not key:
+            # 키 없이도 앱은 뜨도록 하고, 실제 호출 시 오류 반환
+            logger.warning("Supabase 환경변수가 설정되지 않았습니다. (SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY)")
+            return
+        self._client = httpx.AsyncClient(
+            base_url=f"{url}/rest/v1",
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # lifespan 밖(스크립트 등)에서 호출된 경우 지연 생성
+            await self.start()
+        if self._client is None:
+            raise SupabaseNotConfigured("Supabase 환경변수가 설정되지 않았습니다.")
+        return self._client
+
+    async def request(self, method: str, table: str, *, params: Optional[Dict[str, Any]] = None,
+                      json: Any = None, prefer: Optional[str] = None,
+                      headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        PostgREST 호출 + 지수 백오프 재시도.
+        - 연결 실패(요청이 서버에 닿지 않음)는 항상 재시도
+        - 타임아웃/5xx/429 는 멱등 요청(GET 등, merge/ignore-duplicates upsert)만 재시도
+        """
+        client = await self._get_client()
+        method = method.upper()
+        hdrs = dict(headers or {})
+        if prefer:
+            hdrs["Prefer"] = prefer
+        idempotent = method in IDEMPOTENT_METHODS or "resolution=" in (prefer or "")
+
+        attempt = 0
+        while True:
+            try:
+                res = await client.request(method, f"/{table}", params=params, json=json, headers=hdrs)
+                if res.status_code not in RETRY_STATUS or not idempotent or attempt >= SUPABASE_RETRIES:
+                    return res
+                logger.warning(f"Supabase {method} {table} → {res.status_code}, 재시도 {attempt + 1}/{SUPABASE_RETRIES}")
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                if attempt >= SUPABASE_RETRIES:
+                    raise
+                logger.warning(f"Supabase 연결 오류({e.__class__.__name__}), 재시도 {attempt + 1}/{SUPABASE_RETRIES}")
+            except httpx.TransportError as e:
+                if not idempotent or attempt >= SUPABASE_RETRIES:
+                    raise
+                logger.warning(f"Supabase 전송 오류({e.__class__.__name__}), 재시도 {attempt + 1}/{SUPABASE_RETRIES}")
+            # 지수 백오프 + 지터
+            await asyncio.sleep(SUPABASE_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+            attempt += 1
+
+    # ----------------- 편의 함수 -----------------
+    async def select(self, table: str, params: Dict[str, Any], **kwargs) -> httpx.Response:
+        return await self.request("GET", table, params=params, **kwargs)
+
+    async def insert(self, table: str, rows: Any, returning: str = "minimal", **kwargs) -> httpx.Response:
+        return await self.request("POST", table, json=rows, prefer=f"return={returning}", **kwargs)
+
+    async def update(self, table: str, filters: Dict[str, Any], values: Dict[str, Any],
+                     returning: str = "representation", **kwargs) -> httpx.Response:
+        return await self.request("PATCH", table, params=filters, json=values, prefer=f"return={returning}", **kwargs)
+
+    async def upsert(self, table: str, rows: Any, on_conflict: str, returning: str = "representation",
+                     resolution: str = "merge-duplicates", **kwargs) -> httpx.Response:
+        # resolution: merge-duplicates(덮어쓰기) | ignore-duplicates(이미 있으면 건너뜀)
+        return await self.request(
+            "POST", table, json=rows, params={"on_conflict": on_conflict},
+            prefer=f"resolution={resolution},return={returning}", **kwargs,
+        )
+
+
+# 앱 전체가 공유하는 인스턴스 (app.py lifespan 에서 start/close)
+supabase = SupabaseRest()
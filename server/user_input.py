@@ -1,67 +1,257 @@
 # server/user_input.py
 import os
+import asyncio
+import re
 import json
+import hashlib
 import logging
-import requests
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 from io import BytesIO
 from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
 from datetime import datetime
 
+from server.supabase_rest import supabase
+
 router = APIRouter()
 logging.basicConfig(level=logging.INFO)
 
-# ======================= 🔹 Supabase REST 설정 ======================= #
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 TABLE = "interviews"
 
-assert SUPABASE_URL and SUPABASE_KEY, "Supabase URL/KEY가 설정되지 않았습니다."
-REST_URL = f"{SUPABASE_URL}/rest/v1/{TABLE}"
-HEADERS = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json",
-    "Prefer": "return=representation"  # 삽입 후 응답 데이터를 받기 위함
-}
+# 이력서 업로드 최대 크기(바이트)
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+# 요청 본문 한도 = 이력서 + 나머지 폼 필드/multipart 경계 여유분
+RESUME_FORM_OVERHEAD = 64 * 1024
+UPLOAD_PATH = "/api/user-input"
+# 파싱 풀: thread | process / 워커 수
+RESUME_PARSE_POOL = os.getenv("RESUME_PARSE_POOL", "thread")
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+# 파일 내용 해시 → 분석 결과 캐시 (같은 이력서로 다른 공고 지원 시 재파싱 생략)
+RESUME_CACHE_MAX = int(os.getenv("RESUME_CACHE_MAX", "256"))
+CHUNK_SIZE = 64 * 1024
+
+_P_TAG = qn("w:p")
+_TBL_TAG = qn("w:tbl")
+
+_parse_pool: Optional[Executor] = None
+_parse_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+
+class ResumeTooLarge(Exception):
+    pass
+
+def _too_large_body() -> bytes:
+    return json.dumps({"ok": False, "error": "RESUME_TOO_LARGE", "max_bytes": RESUME_MAX_BYTES}).encode()
+
+
+class ResumeUploadLimit:
+    """
+    ASGI 미들웨어: /api/user-input 본문을 폼 파싱 전에 제한
+    - Content-Length 가 한도를 넘으면 본문을 읽지 않고 바로 413
+    - chunked 등 길이를 모르는 업로드는 받는 동안 바이트를 세다가 넘으면 읽기를 멈추고 413
+      (폼 파싱이 실패하며 만든 응답 대신 413 을 보냄)
+    """
+
+    def __init__(self, app, path: str = UPLOAD_PATH, max_bytes: int = RESUME_MAX_BYTES + RESUME_FORM_OVERHEAD):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            return await self.app(scope, receive, send)
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            return await self._reject(send)
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise ResumeTooLarge()
+            return message
+
+        started = False
+
+        async def guarded_send(message):
+            nonlocal started
+            if not exceeded:
+                return await send(message)
+            if message["type"] == "http.response.start" and not started:
+                started = True
+                await self._reject(send)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except ResumeTooLarge:
+            if not started:
+                await self._reject(send)
+
+    @staticmethod
+    async def _reject(send):
+        body = _too_large_body()
+        await send({"type": "http.response.start", "status": 413, "headers": [
+            (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+            (b"connection", b"close"),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+# ======================= 🔹 섹션 분류기 ======================= #
+# 키워드 표(resume_sections.json)로 시작 시 한 번만 정규식을 만들어 둠 → 줄마다 한 번 훑어서 섹션 결정
+# 표를 바꾸거나 RESUME_SECTIONS_FILE 로 다른 파일을 지정하면 코드 수정 없이 섹션 추가 가능 (예: 수상, 어학)
+RESUME_SECTIONS_FILE = os.getenv(
+    "RESUME_SECTIONS_FILE", os.path.join(os.path.dirname(__file__), "resume_sections.json")
+)
+
+class SectionClassifier:
+    def __init__(self, sections: List[dict], default: str = "기타"):
+        self.names = [s["name"] for s in sections]
+        self.default = default
+        self.line = self._compile(sections, "line")
+        self.table = self._compile(sections, "table")
+
+    @staticmethod
+    def _compile(sections: List[dict], kind: str):
+        # 키워드 → 우선순위(표 순서). 같은 키워드가 여러 섹션에 있으면 먼저 나온 섹션
+        priority: Dict[str, int] = {}
+        for i, sec in enumerate(sections):
+            for kw in sec.get(kind, []):
+                priority.setdefault(kw.replace(" ", ""), i)
+        if not priority:
+            return None, {}
+        # 글자 사이 공백 허용 (기존의 replace(" ", "") 비교와 동일)
+        alts = sorted(priority, key=len, reverse=True)
+        pattern = "|".join(r"\s*".join(map(re.escape, kw)) for kw in alts)
+        # 전방탐색으로 겹치는 위치의 키워드도 모두 찾음
+        return re.compile(f"(?=({pattern}))"), priority
+
+    def _classify(self, text: str, compiled) -> Optional[str]:
+        regex, priority = compiled
+        if regex is None:
+            return None
+        best = None
+        for m in regex.finditer(text):
+            rank = priority[re.sub(r"\s+", "", m.group(1))]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return None if best is None else self.names[best]
+
+    def classify_line(self, line: str) -> Optional[str]:
+        return self._classify(line, self.line)
+
+    def classify_table(self, header: List[str]) -> str:
+        return self._classify("".join(header), self.table) or self.default
+
+    def empty(self) -> Dict[str, List[str]]:
+        return {name: [] for name in [*self.names, self.default]}
+
+def load_section_classifier(path: str = RESUME_SECTIONS_FILE) -> SectionClassifier:
+    with open(path, encoding="utf-8") as f:
+        conf = json.load(f)
+    return SectionClassifier(conf["sections"], conf.get("default", "기타"))
+
+section_classifier = load_section_classifier()
 
 # ======================= 🔹 이력서 분석 함수 ======================= #
-def extract_text_and_tables_from_docx(file_bytes):
-    doc = Document(BytesIO(file_bytes))
-    full_text, tables_data = [], []
-    for para in doc.paragraphs:
-        if para.text.strip():
-            full_text.append(para.text.strip())
-    for table in doc.tables:
-        tdata = []
-        for row in table.rows:
-            tdata.append([cell.text.strip() for cell in row.cells])
-        tables_data.append(tdata)
-    return full_text, tables_data
-
-def extract_sections(full_text, tables_data):
-    sections = {"학력":"", "가족사항":"", "경력":"", "프로젝트":"", "자격증":"", "기타":""}
-    current_section = "기타"
-    for line in full_text:
-        line_clean = line.replace(" ","")
-        if "학력" in line_clean: current_section="학력"
-        elif "가족사항" in line_clean: current_section="가족사항"
-        elif "경력" in line_clean: current_section="경력"
-        elif "프로젝트" in line_clean: current_section="프로젝트"
-        elif "자격증" in line_clean or "컴퓨터" in line_clean: current_section="자격증"
-        sections[current_section] += line + "\n"
-    for table in tables_data:
-        header_row = table[0]
-        header_text = "".join(header_row).replace(" ", "")
-        target_section = "기타"
-        if any(k in header_text for k in ["졸업","학교","학력"]): target_section="학력"
-        elif any(k in header_text for k in ["관계","직업","가족"]): target_section="가족사항"
-        elif any(k in header_text for k in ["근무","회사","직위","경력"]): target_section="경력"
-        elif any(k in header_text for k in ["프로젝트"]): target_section="프로젝트"
-        elif any(k in header_text for k in ["자격","컴퓨터"]): target_section="자격증"
-        sections[target_section] += "\n".join(["\t".join(row) for row in table]) + "\n"
-    return sections
+def extract_blocks_from_docx(source) -> List[Tuple[str, object]]:
+    """문서 순서대로 ("p", 문단 텍스트) / ("t", 표 행 목록) 반환"""
+    # source: 파일 객체(임시파일) 또는 bytes
+    doc = Document(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    blocks: List[Tuple[str, object]] = []
+    for child in doc.element.body.iterchildren():
+        if child.tag == _P_TAG:
+            text = Paragraph(child, doc).text.strip()
+            if text:
+                blocks.append(("p", text))
+        elif child.tag == _TBL_TAG:
+            rows = [[cell.text.strip() for cell in row.cells] for row in Table(child, doc).rows]
+            if rows:
+                blocks.append(("t", rows))
+    return blocks
+
+def extract_sections(blocks, classifier: SectionClassifier = None) -> Dict[str, str]:
+    # 본문 문단은 섹션 제목이 나온 뒤로 같은 섹션에 누적, 표는 머리글로 개별 분류
+    classifier = classifier or section_classifier
+    parts = classifier.empty()
+    current_section = classifier.default
+    for kind, content in blocks:
+        if kind == "p":
+            current_section = classifier.classify_line(content) or current_section
+            parts[current_section].append(content + "\n")
+        else:
+            target_section = classifier.classify_table(content[0])
+            parts[target_section].append("\n".join("\t".join(row) for row in content) + "\n")
+    return {name: "".join(chunks) for name, chunks in parts.items()}
+
+def parse_resume(source) -> Dict[str, str]:
+    """워커(스레드/프로세스)에서 실행: docx(파일 객체 또는 bytes) → 섹션별 텍스트"""
+    return extract_sections(extract_blocks_from_docx(source))
+
+# ======================= 🔹 업로드 / 파싱 풀 ======================= #
+def _get_parse_pool() -> Executor:
+    global _parse_pool
+    if _parse_pool is None:
+        if RESUME_PARSE_POOL == "process":
+            _parse_pool = ProcessPoolExecutor(max_workers=RESUME_PARSE_WORKERS)
+        else:
+            _parse_pool = ThreadPoolExecutor(max_workers=RESUME_PARSE_WORKERS, thread_name_prefix="resume")
+    return _parse_pool
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+def _hash_file(f) -> Tuple[str, int]:
+    """업로드 파일을 조각 단위로 읽어 sha256 계산 (크기를 모르는 경우 대비해 여기서도 제한 확인) 후 처음으로 되감기"""
+    digest = hashlib.sha256()
+    size = 0
+    f.seek(0)
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > RESUME_MAX_BYTES:
+            raise ResumeTooLarge()
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest(), size
+
+async def analyze_resume(upload: UploadFile) -> Dict[str, str]:
+    # 업로드 크기는 폼 파싱 때 이미 알고 있음 → 내용을 읽기 전에 거절
+    if upload.size is not None and upload.size > RESUME_MAX_BYTES:
+        raise ResumeTooLarge()
+    key, size = await asyncio.to_thread(_hash_file, upload.file)
+    cached = _parse_cache.get(key)
+    if cached is not None:
+        _parse_cache.move_to_end(key)
+        logging.info(f"이력서 분석 캐시 사용 ({size} bytes)")
+        return dict(cached)
+    # 스레드 풀은 업로드 파일을 그대로 읽음, 프로세스 풀에는 파일 객체를 넘길 수 없으므로 bytes 로 전달
+    source = await asyncio.to_thread(upload.file.read) if RESUME_PARSE_POOL == "process" else upload.file
+    loop = asyncio.get_running_loop()
+    sections = await loop.run_in_executor(_get_parse_pool(), parse_resume, source)
+    _parse_cache[key] = sections
+    while len(_parse_cache) > RESUME_CACHE_MAX:
+        _parse_cache.popitem(last=False)
+    return dict(sections)
 
 # ======================= 🔹 API 엔드포인트 ======================= #
 @router.post("/user-input")
@@ -79,13 +269,16 @@ async def save_user_input(
         # 1️⃣ 이력서 분석
         analysis_result = {}
         if resume:
-            file_bytes = await resume.read()
-            full_text, tables = extract_text_and_tables_from_docx(file_bytes)
-            analysis_result = extract_sections(full_text, tables)
-            logging.info("✅ 분석 결과:")
-            for k,v in analysis_result.items():
-                preview = v.strip()[:200] + ("..." if len(v.strip()) > 200 else "")
-                logging.info(f"--- {k} ---\n{preview}\n")
+            try:
+                analysis_result = await analyze_resume(resume)
+            except ResumeTooLarge:
+                return JSONResponse(status_code=413, content={
+                    "ok": False, "error": "RESUME_TOO_LARGE", "max_bytes": RESUME_MAX_BYTES,
+                })
+            except Exception as e:
+                logging.warning(f"⚠️ 이력서 파싱 실패: {e}")
+                return JSONResponse(status_code=400, content={"ok": False, "error": "RESUME_PARSE_FAILED"})
+            logging.info("✅ 분석 결과: " + ", ".join(f"{k} {len(v)}자" for k, v in analysis_result.items()))
         else:
             logging.warning("⚠️ 이력서 파일 없음")
 
@@ -99,13 +292,13 @@ async def save_user_input(
             "analysis": analysis_result
         }
 
-        response = requests.post(REST_URL, headers=HEADERS, data=json.dumps(record))
-        if not response.ok:
+        # 삽입 후 응답 데이터를 받기 위해 return=representation
+        response = await supabase.insert(TABLE, record, returning="representation")
+        if not response.is_success:
             logging.error(f"❌ DB 저장 실패: {response.text}")
             return JSONResponse(status_code=400, content={"ok": False, "error": response.text})
 
         logging.info("✅ DB 저장 성공")
-        logging.info(f"DB 응답: {response.json()}")
 
         return {"ok": True, "analysis": analysis_result}
 
@@ -1,89 +1,207 @@
 # server/voice.py
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from pydub import AudioSegment
-import io, os
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import JSONResponse
+import os
+import time
+import subprocess
+import asyncio
+import threading
 import numpy as np
-import librosa
-import whisper
-from functools import lru_cache
 import logging
 
+from server.prosody import analyze_prosody
+from server.voice_jobs import AnalyzeJobQueue, STT_WORKERS
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@lru_cache(maxsize=1)
-def get_model():
+SAMPLE_RATE = 16000
+
+# ───────────────────── STT 백엔드 ─────────────────────
+# STT_BACKEND: "whisper"(openai-whisper, fp32 PyTorch) | "faster-whisper"(CTranslate2, int8 양자화 CPU 추론)
+STT_BACKEND = os.getenv("STT_BACKEND", "whisper")
+# CPU 환경 권장: "small" (medium은 매우 느리고 메모리 큼)
+STT_MODEL = os.getenv("STT_MODEL", "small")
+STT_DEVICE = os.getenv("STT_DEVICE", "cpu")
+# faster-whisper 연산 타입 (int8 / int8_float16 / float32 …)
+STT_COMPUTE_TYPE = os.getenv("STT_COMPUTE_TYPE", "int8")
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "ko")
+# 서버 시작 시 모델 로딩 + 워밍업 추론 여부
+STT_WARMUP = os.getenv("STT_WARMUP", "1") not in ("0", "false", "False")
+
+class SttBackend:
+    """
+    STT 엔진 공통 인터페이스.
+    load() 는 한 번만 호출, transcribe() 는 16k mono float32 배열 → 텍스트
+    kwargs: initial_prompt, condition_on_previous_text (두 엔진 공통)
+    """
+    name = "base"
+
+    def __init__(self, model: str = STT_MODEL, device: str = STT_DEVICE):
+        self.model_name = model
+        self.device = device
+        self.model = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def transcribe(self, y: np.ndarray, **kwargs) -> str:
+        raise NotImplementedError
+
+class OpenAIWhisperBackend(SttBackend):
+    name = "whisper"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 모델 1개를 여러 워커 스레드가 공유 → transcribe 는 동시에 하나만 (디코더 KV 캐시 훅이 모델에 걸림)
+        self._lock = threading.Lock()
+
+    def load(self):
+        import whisper
+        # GPU면 STT_DEVICE=cuda, STT_MODEL=medium
+        self.model = whisper.load_model(self.model_name, device=self.device)
+
+    def transcribe(self, y: np.ndarray, **kwargs) -> str:
+        # ndarray로 직접 전달 가능. CPU는 fp16=False 필수.
+        with self._lock:
+            result = self.model.transcribe(y, fp16=self.device != "cpu", language=STT_LANGUAGE, **kwargs)
+        return (result.get("text") or "").strip()
+
+class FasterWhisperBackend(SttBackend):
+    name = "faster-whisper"
+
+    def __init__(self, *args, compute_type: str = STT_COMPUTE_TYPE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compute_type = compute_type
+
+    def load(self):
+        from faster_whisper import WhisperModel
+        # CTranslate2 모델은 여러 스레드에서 동시에 호출 가능 (num_workers 만큼 병렬)
+        # 작업 큐와 같은 워커 수 사용 → 큐 워커가 모델 앞에서 줄 서지 않음
+        self.model = WhisperModel(
+            self.model_name, device=self.device, compute_type=self.compute_type,
+            num_workers=STT_WORKERS,
+        )
+
+    def transcribe(self, y: np.ndarray, **kwargs) -> str:
+        segments, _info = self.model.transcribe(y, language=STT_LANGUAGE, beam_size=5, **kwargs)
+        return "".join(seg.text for seg in segments).strip()
+
+STT_BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+def create_backend(name: str = STT_BACKEND, **kwargs) -> SttBackend:
+    if name not in STT_BACKENDS:
+        raise ValueError(f"알 수 없는 STT_BACKEND: {name} (가능: {', '.join(STT_BACKENDS)})")
+    return STT_BACKENDS[name](**kwargs)
+
+# /health 에서 보고하는 준비 상태 (warming: 워밍업 진행 중, 끝나면 성공/실패와 관계없이 False)
+stt_status = {"ready": False, "warming": STT_WARMUP, "backend": STT_BACKEND, "model": STT_MODEL,
+              "load_ms": None, "warmup_ms": None, "error": None}
+
+_backend: SttBackend = None
+_backend_lock = threading.Lock()
+
+def get_backend() -> SttBackend:
+    # 워밍업 중에 들어온 요청이 모델을 한 번 더 로딩하지 않도록 첫 로딩은 락으로 한 번만 (로딩 후에는 락 없이 반환)
+    global _backend
+    if _backend is not None:
+        return _backend
+    with _backend_lock:
+        if _backend is not None:
+            return _backend
+        try:
+            logger.info(f"STT 모델 로딩 중... backend={STT_BACKEND}, model={STT_MODEL}")
+            t0 = time.perf_counter()
+            backend = create_backend()
+            backend.load()
+            stt_status["load_ms"] = round((time.perf_counter() - t0) * 1000)
+            logger.info(f"STT 모델 로딩 완료 ({stt_status['load_ms']}ms)")
+        except Exception as e:
+            logger.error(f"STT 모델 로딩 실패: {e}")
+            stt_status["error"] = str(e)
+            raise HTTPException(status_code=500, detail=f"STT 모델 로딩 실패: {e}")
+        _backend = backend
+        return _backend
+
+def warm_up_stt():
+    """모델을 미리 로딩하고 1초 무음으로 한 번 추론 (첫 면접 요청이 로딩을 기다리지 않도록)"""
+    stt_status["warming"] = True
     try:
-        # CPU 환경 권장: "small" (medium은 매우 느리고 메모리 큼)
-        # GPU면 whisper.load_model("medium", device="cuda")
-        logger.info("Whisper 모델 로딩 중...")
-        model = whisper.load_model("small")
-        logger.info("Whisper 모델 로딩 완료")
-        return model
+        backend = get_backend()
+        t0 = time.perf_counter()
+        backend.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
     except Exception as e:
-        logger.error(f"Whisper 모델 로딩 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"Whisper 모델 로딩 실패: {e}")
+        # 로딩 실패는 캐시되지 않으므로 첫 요청 때 다시 로딩을 시도함
+        logger.error(f"STT 워밍업 실패: {e}")
+        stt_status["error"] = str(e)
+        return
+    finally:
+        stt_status["warming"] = False
+    stt_status["warmup_ms"] = round((time.perf_counter() - t0) * 1000)
+    stt_status["ready"] = True
+    stt_status["error"] = None
+    logger.info(f"STT 워밍업 완료 ({stt_status['warmup_ms']}ms)")
+
+def transcribe_array(y: np.ndarray, **kwargs) -> str:
+    """16k mono float32 배열 → 텍스트 (설정된 백엔드 사용)"""
+    return get_backend().transcribe(y, **kwargs)
 
-def _to_wav_16k_mono(audio_bytes: bytes, fmt: str = "webm") -> bytes:
-    # webm/opus → wav 16k mono
+def _decode_pcm_16k_mono(audio_bytes: bytes) -> np.ndarray:
+    """
+    webm/ogg/wav 등 → 16k mono float32 ndarray
+    ffmpeg가 raw PCM(f32le)을 파이프로 바로 출력 → 중간 WAV 컨테이너/재파싱/재리샘플링 없음
+    같은 배열을 신호 특징과 Whisper에 그대로 사용
+    """
+    logger.info("오디오 디코딩 시작: ffmpeg -> f32le 16k mono")
     try:
-        logger.info(f"오디오 변환 시작: {fmt} -> wav")
-        src = AudioSegment.from_file(io.BytesIO(audio_bytes), format=fmt)
-        logger.info(f"원본 오디오: 길이={len(src)}ms, 채널={src.channels}, 샘플레이트={src.frame_rate}")
-    except Exception as e:
-        logger.error(f"입력 오디오 디코딩 실패({fmt}): {e}")
-        raise HTTPException(status_code=400, detail=f"입력 오디오 디코딩 실패({fmt}): {e}")
+        proc = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin",
+             "-i", "pipe:0", "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+            input=audio_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+        )
+    except OSError as e:
+        logger.error(f"ffmpeg 실행 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"ffmpeg 실행 실패: {e}")
+    if proc.returncode != 0:
+        err = proc.stderr.decode("utf-8", "ignore").strip()[-300:]
+        logger.error(f"입력 오디오 디코딩 실패: {err}")
+        raise HTTPException(status_code=400, detail=f"입력 오디오 디코딩 실패: {err}")
 
-    src = src.set_frame_rate(16000).set_channels(1)
-    out = io.BytesIO()
-    # 파라미터로 강제 지정도 가능: parameters=["-ac", "1", "-ar", "16000"]
-    src.export(out, format="wav")
-    out.seek(0)
-    logger.info("오디오 변환 완료")
-    return out.read()
+    out = proc.stdout
+    y = np.frombuffer(out, dtype=np.float32, count=len(out) // 4)
+    logger.info(f"오디오 디코딩 완료: {y.size} samples")
+    return y
 
 def analyze_audio(audio_bytes: bytes, input_fmt: str):
     try:
         logger.info(f"오디오 분석 시작: 크기={len(audio_bytes)} bytes, 포맷={input_fmt}")
         
-        # 1) webm/ogg/wav 등 포맷 분기
-        fmt = input_fmt or "webm"
-        fmt = fmt.split("/")[-1].lower() if "/" in fmt else fmt.lower()
-        if fmt in ("webm", "ogg", "opus"):
-            wav_bytes = _to_wav_16k_mono(audio_bytes, fmt="webm")
-        elif fmt in ("wav", "x-wav"):
-            wav_bytes = audio_bytes  # 그대로
-        else:
-            # 기타 포맷도 ffmpeg가 처리 가능하나, 명시적으로 webm 기본 처리
-            wav_bytes = _to_wav_16k_mono(audio_bytes, fmt="webm")
-
-        # 2) librosa 로드(16k mono 보장)
-        y, sr = librosa.load(io.BytesIO(wav_bytes), sr=16000, mono=True)
-        logger.info(f"librosa 로드 완료: 길이={y.size} samples, sr={sr}")
-        
+        # 1) 디코딩 (포맷은 ffmpeg가 판별, 16k mono 보장)
+        y = _decode_pcm_16k_mono(audio_bytes)
+        sr = SAMPLE_RATE
+
         if y.size == 0:
             logger.error("빈 오디오 데이터")
             raise HTTPException(status_code=400, detail="빈 오디오입니다.")
 
-        # 3) 간단 신호 특징
-        energy = float(np.mean(y ** 2))
-        pitches, mags = librosa.piptrack(y=y, sr=sr)
-        pitch_vals = pitches[mags > 0]
-        avg_pitch = float(np.mean(pitch_vals)) if pitch_vals.size > 0 else 0.0
-        logger.info(f"신호 분석 완료: energy={energy}, avg_pitch={avg_pitch}")
-
-        # 4) Whisper 추론
-        model = get_model()
+        # 2) Whisper 추론
         logger.info("Whisper 추론 시작...")
-        # ndarray로 직접 전달 가능. CPU는 fp16=False 필수.
-        result = model.transcribe(y, fp16=False, language="ko")  # language 생략 가능(자동)
-        text = (result.get("text") or "").strip()
+        text = transcribe_array(y)
         logger.info(f"Whisper 추론 완료: '{text}'")
 
-        # 5) 매우 러프한 감정 힌트
+        # 3) 발화 전달력 특징 (RMS / YIN F0 / 쉼 / 말하기 속도) — 한 번 훑기
+        prosody = analyze_prosody(y, sr, text=text)
+        energy = prosody["energy"]
+        avg_pitch = prosody["f0_mean"]
+        logger.info(f"신호 분석 완료: energy={energy}, f0={avg_pitch}, pauses={prosody['pause_count']}")
+
+        # 4) 매우 러프한 감정 힌트 (하위 호환용, 전달력 지표는 prosody 참고)
         emotion = "Neutral"
         if energy > 0.01:
             emotion = "Active"
@@ -93,6 +211,7 @@ def analyze_audio(audio_bytes: bytes, input_fmt: str):
         return {
             "text": text,
             "signal": {"energy": energy, "avg_pitch": avg_pitch},
+            "prosody": prosody,
             "emotion": emotion,
             "sr": sr,
             "dur_sec": round(y.size / sr, 3),
@@ -103,16 +222,29 @@ def analyze_audio(audio_bytes: bytes, input_fmt: str):
         logger.error(f"오디오 분석 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"오디오 분석 실패: {e}")
 
+# 작업 큐: 이벤트 루프를 막지 않도록 analyze_audio 는 워커 스레드에서 실행
+analyze_jobs = AnalyzeJobQueue(analyze_audio)
+
 @router.post("/analyze")
-async def analyze(audio: UploadFile = File(...)):
+async def analyze(audio: UploadFile = File(...), wait: bool = Query(False)):
+    """
+    오디오를 작업 큐에 넣고 job_id 반환 → GET /api/analyze/{job_id} 로 결과 조회
+    wait=true 면 완료까지 기다렸다가 결과를 바로 반환(기존 동작)
+    """
     try:
         logger.info(f"STT 요청 수신: filename={audio.filename}, content_type={audio.content_type}")
         audio_bytes = await audio.read()
         logger.info(f"오디오 파일 읽기 완료: {len(audio_bytes)} bytes")
-        
-        result = analyze_audio(audio_bytes, audio.content_type or "webm")
-        logger.info(f"STT 분석 성공: '{result['text']}'")
-        return result
+
+        job = await analyze_jobs.submit(audio_bytes, audio.content_type or "webm")
+        if not wait:
+            return {"ok": True, "job_id": job.id, "status": job.status}
+
+        await job.done.wait()
+        if job.status == "error":
+            raise HTTPException(status_code=job.error_status, detail=job.error)
+        logger.info(f"STT 분석 성공: '{job.result['text']}'")
+        return job.result
     except HTTPException as he:
         logger.error(f"HTTPException: {he.detail}")
         raise he
@@ -120,3 +252,21 @@ async def analyze(audio: UploadFile = File(...)):
         logger.error(f"예상치 못한 오류: {e}")
         # 디버깅을 돕는 명확한 에러 메시지
         return {"text": "", "signal": {}, "emotion": "Error", "error": str(e)}
+
+@router.get("/analyze/metrics")
+async def analyze_metrics():
+    # 대기열 길이 / 대기·처리 시간 백분위 (용량 산정용)
+    return {"ok": True, **analyze_jobs.metrics()}
+
+@router.get("/analyze/{job_id}")
+async def analyze_status(job_id: str, wait: float = Query(0, ge=0, le=30)):
+    """작업 상태/결과 조회. wait>0 이면 최대 wait 초 동안 완료를 기다림(long-poll)"""
+    job = analyze_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"ok": False, "job_id": job_id, "error": "JOB_NOT_FOUND"})
+    if wait and not job.done.is_set():
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+    return job.to_dict()
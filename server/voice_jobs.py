@@ -0,0 +1,188 @@
+# server/voice_jobs.py — 음성 분석(STT) 작업 큐
+# POST /api/analyze 는 작업만 넣고 job_id 반환 → 제한된 워커 풀이 순서대로 처리 → 클라이언트는 폴링
+import os
+import time
+import uuid
+import asyncio
+import logging
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# 워커 수: 기본은 코어 수의 절반(Whisper 추론 자체가 내부적으로 여러 코어를 사용)
+STT_WORKERS = max(1, int(os.getenv("STT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))))
+# 대기열 최대 길이 (넘으면 503)
+STT_QUEUE_MAX = int(os.getenv("STT_QUEUE_MAX", "64"))
+# 완료된 작업 결과 보관 시간(초)
+STT_JOB_TTL = float(os.getenv("STT_JOB_TTL", "900"))
+
+
+class AnalyzeJob:
+    def __init__(self, audio_bytes: bytes, fmt: str):
+        self.id = uuid.uuid4().hex
+        self.audio_bytes = audio_bytes
+        self.fmt = fmt
+        self.status = "queued"  # queued → running → done / error
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.error_status = 500
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"ok": self.status != "error", "job_id": self.id, "status": self.status}
+        if self.started_at:
+            out["wait_ms"] = round((self.started_at - self.created_at) * 1000)
+        if self.finished_at and self.started_at:
+            out["run_ms"] = round((self.finished_at - self.started_at) * 1000)
+        if self.status == "done":
+            out.update(self.result or {})
+        elif self.status == "error":
+            out["error"] = self.error
+        return out
+
+
+class AnalyzeJobQueue:
+    """
+    asyncio.Queue + 전용 스레드 풀.
+    - 이벤트 루프는 작업 등록/조회만 담당하고, 디코딩·특징 추출·Whisper 추론은 워커 스레드에서 실행
+    - 대기열 길이, 대기/처리 시간 지표 제공 (모의면접 피크 용량 산정용)
+    - run(): 실시간 STT 처럼 큐를 거치지 않는 추론도 같은 스레드 풀에서 실행 → 동시 추론 수는 workers 로 제한
+    """
+
+    def __init__(self, fn: Callable[[bytes, str], Dict[str, Any]], workers: int = STT_WORKERS,
+                 maxsize: int = STT_QUEUE_MAX, job_ttl: float = STT_JOB_TTL):
+        self.fn = fn
+        self.workers = workers
+        self.maxsize = maxsize
+        self.job_ttl = job_ttl
+        self._jobs: Dict[str, AnalyzeJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks = []
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._direct_calls = 0
+        self._direct_running = 0
+        # 최근 작업의 대기/처리 시간(초) — 백분위 계산용
+        self._wait_times = deque(maxlen=500)
+        self._run_times = deque(maxlen=500)
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stt")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"STT 작업 큐 시작: workers={self.workers}, maxsize={self.maxsize}")
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._queue = None
+        self._executor = None
+
+    async def submit(self, audio_bytes: bytes, fmt: str) -> AnalyzeJob:
+        if self._queue is None:
+            await self.start()
+        self._purge()
+        job = AnalyzeJob(audio_bytes, fmt)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise HTTPException(status_code=503, detail="STT_QUEUE_FULL")
+        self._jobs[job.id] = job
+        return job
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """작업 큐를 거치지 않고 공용 STT 스레드 풀에서 바로 실행 (풀이 차 있으면 자리 날 때까지 대기)"""
+        if self._executor is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        self._direct_calls += 1
+        self._direct_running += 1
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self._direct_running -= 1
+
+    def busy(self) -> bool:
+        """대기 중인 작업이 있거나 워커가 모두 사용 중 (중간 자막처럼 미뤄도 되는 추론은 건너뛰는 기준)"""
+        queued = self._queue.qsize() if self._queue else 0
+        return queued > 0 or self._running + self._direct_running >= self.workers
+
+    def get(self, job_id: str) -> Optional[AnalyzeJob]:
+        return self._jobs.get(job_id)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            self._running += 1
+            self._wait_times.append(job.started_at - job.created_at)
+            try:
+                job.result = await loop.run_in_executor(self._executor, self.fn, job.audio_bytes, job.fmt)
+                job.status = "done"
+                self._completed += 1
+            except HTTPException as he:
+                job.status, job.error, job.error_status = "error", str(he.detail), he.status_code
+                self._failed += 1
+            except Exception as e:
+                logger.error(f"STT 작업 실패({job.id}): {e}")
+                job.status, job.error = "error", str(e)
+                self._failed += 1
+            finally:
+                job.finished_at = time.time()
+                job.audio_bytes = b""  # 처리 끝난 원본 오디오는 바로 해제
+                self._run_times.append(job.finished_at - job.started_at)
+                self._running -= 1
+                job.done.set()
+                self._queue.task_done()
+
+    def _purge(self):
+        now = time.time()
+        expired = [jid for jid, j in self._jobs.items() if j.finished_at and now - j.finished_at > self.job_ttl]
+        for jid in expired:
+            self._jobs.pop(jid, None)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_max": self.maxsize,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "direct_calls": self._direct_calls,
+            "direct_running": self._direct_running,
+            "wait_ms": _percentiles(self._wait_times),
+            "run_ms": _percentiles(self._run_times),
+        }
+
+
+def _percentiles(values) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    vs = sorted(values)
+
+    def pick(q):
+        return round(vs[min(len(vs) - 1, int(q * len(vs)))] * 1000, 1)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "max": round(vs[-1] * 1000, 1)}
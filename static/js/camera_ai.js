@@ -36,8 +36,15 @@ canvas.height = 360
 const WS_URL =
   (location.protocol === 'https:' ? 'wss://' : 'ws://') +
   location.host +
-  '/api/ws'
+  '/api/ws?proto=bin' // 압축 바이너리 프로토콜 (헤더+JPEG ↑, 고정 길이 결과 ↓)
+// 서버 누적 통계용 세션 id (첫 메시지로 발급됨, 면접 페이지마다 새 세션)
+let cameraSessionId = null
+// 바이너리 결과의 enum 코드 → 라벨 (첫 메시지로 전달됨)
+let directionLabels = []
+let gazeLabels = []
+let frameSeq = 0
 const socket = new WebSocket(WS_URL)
+socket.binaryType = 'arraybuffer'
 
 socket.onopen = () => appendLog('🔌 WebSocket 연결됨')
 socket.onclose = () => appendLog('❌ WebSocket 종료')
@@ -45,7 +52,18 @@ socket.onerror = (e) => appendLog('⚠️ WebSocket 오류: ' + (e?.message || e
 
 socket.onmessage = (event) => {
   try {
-    const data = JSON.parse(event.data)
+    const data =
+      typeof event.data === 'string'
+        ? JSON.parse(event.data)
+        : decodeBinaryResult(event.data)
+    if (data.session) {
+      cameraSessionId = data.session
+      if (data.enums) {
+        directionLabels = invertEnum(data.enums.direction)
+        gazeLabels = invertEnum(data.enums.gaze)
+      }
+      return
+    }
     if (!data.ok) {
       appendLog('⚠️ 분석 실패: ' + (data.err || 'unknown'))
       return
@@ -106,7 +124,10 @@ socket.onmessage = (event) => {
 
     // 디버그/로그 표시
     appendLog(
-      `📍 방향:${r.direction} / 👀 시선:${r.gaze} / 🙂 미소:${r.smile} / 🧭 yaw:${r.yaw}`
+      `📍 방향:${r.direction} / 👀 시선:${r.gaze} / 🙂 미소:${r.smile} / 🧭 yaw:${r.yaw}` +
+        ` / ⏱ ${data.latency_ms ?? '-'}ms` +
+        (data.rtt_ms != null ? ` (왕복 ${data.rtt_ms}ms)` : '') +
+        ` (drop ${data.dropped ?? 0})`
     )
   } catch (e) {
     appendLog('📩 ' + event.data)
@@ -118,7 +139,8 @@ navigator.mediaDevices
   .then((stream) => {
     video.srcObject = stream
     appendLog('📷 카메라 시작')
-    setInterval(captureAndSend, 1000) // 1초마다 캡처(트래픽 절약)
+    // 초당 5프레임 캡처. 서버가 밀리면 최신 프레임만 분석하고 나머지는 버림(dropped)
+    setInterval(captureAndSend, 200)
   })
   .catch((err) => {
     appendLog('❌ 카메라 실패: ' + err.message)
@@ -132,13 +154,49 @@ function captureAndSend() {
   canvas.toBlob(
     (blob) => {
       if (!blob) return
-      blob.arrayBuffer().then((buf) => socket.send(buf))
+      // 헤더: [seq u32][client_ts f64(ms)] (little-endian) + JPEG
+      const header = new DataView(new ArrayBuffer(12))
+      header.setUint32(0, frameSeq++ >>> 0, true)
+      header.setFloat64(4, performance.now(), true)
+      socket.send(new Blob([header.buffer, blob]))
     },
     'image/jpeg',
     0.8 // JPEG 품질(0.0~1.0). 트래픽을 더 줄이고 싶으면 0.7~0.6로 낮출 수 있음
   )
 }
 
+// 다운스트림 결과 (31바이트, little-endian):
+// [status u8][seq u32][client_ts f64][direction u8][gaze u8][smile f32][yaw f32][dropped u32][latency_ms f32]
+function decodeBinaryResult(buf) {
+  const v = new DataView(buf)
+  const base = {
+    seq: v.getUint32(1, true),
+    dropped: v.getUint32(23, true),
+    latency_ms: Math.round(v.getFloat32(27, true) * 10) / 10,
+    rtt_ms: Math.round(performance.now() - v.getFloat64(5, true)),
+  }
+  if (v.getUint8(0) !== 0) return { ok: false, err: 'decode_fail', ...base }
+
+  const smile = v.getFloat32(15, true)
+  const yaw = v.getFloat32(19, true)
+  return {
+    ok: true,
+    ...base,
+    result: {
+      direction: directionLabels[v.getUint8(13)] ?? '알 수 없음',
+      gaze: gazeLabels[v.getUint8(14)] ?? '알 수 없음',
+      smile: Number.isNaN(smile) ? null : Math.round(smile * 100) / 100,
+      yaw: Number.isNaN(yaw) ? null : Math.round(yaw * 1000) / 1000,
+    },
+  }
+}
+
+function invertEnum(codes) {
+  const labels = []
+  for (const [label, code] of Object.entries(codes || {})) labels[code] = label
+  return labels
+}
+
 function appendLog(msg) {
   const now = new Date().toLocaleTimeString('ko-KR', { hour12: false })
   const div = document.createElement('div')
@@ -198,5 +256,27 @@ function calculateFinalScores() {
   }
 }
 
+// 서버에서 누적한 세션 점수 조회 (실패 시 브라우저 계산값 사용)
+async function fetchSessionScores() {
+  if (!cameraSessionId) return calculateFinalScores()
+  try {
+    const res = await fetch(
+      '/api/result?session=' + encodeURIComponent(cameraSessionId)
+    )
+    const data = await res.json()
+    if (!data.ok) throw new Error(data.error || 'unknown')
+    return {
+      direction: data.detailFeedback.direction,
+      gaze: data.detailFeedback.eye,
+      smile: data.detailFeedback.smile,
+      overall: data.overallScore,
+    }
+  } catch (e) {
+    console.warn('서버 세션 점수 조회 실패, 로컬 계산 사용:', e)
+    return calculateFinalScores()
+  }
+}
+
 // 글로벌 함수로 내보내기 (interview.js에서 사용)
 window.getCameraAnalysisScores = calculateFinalScores
+window.getCameraSessionScores = fetchSessionScores
@@ -12,6 +12,7 @@ let isInterviewStarted = false
 let mediaRecorder = null
 let isRecording = false
 let recordedChunks = []
+let sttStream = null // 실시간 STT WebSocket (녹음 중에만 사용)
 
 /* ========= 첫 번째 질문 생성 (면접 시작) ========= */
 async function generateFirstQuestion() {
@@ -373,7 +374,10 @@ ${fullConversation}
       // OpenRouter 응답을 그대로 피드백으로 사용
       // 영상 분석 점수 가져오기
       let cameraScores = { direction: 80, gaze: 75, smile: 90, overall: 82 } // 기본값
-      if (typeof window.getCameraAnalysisScores === 'function') {
+      if (typeof window.getCameraSessionScores === 'function') {
+        cameraScores = await window.getCameraSessionScores()
+        console.log('카메라 분석 점수:', cameraScores)
+      } else if (typeof window.getCameraAnalysisScores === 'function') {
         cameraScores = window.getCameraAnalysisScores()
         console.log('카메라 분석 점수:', cameraScores)
       }
@@ -409,7 +413,9 @@ ${fullConversation}
     // 오류 시 기본 피드백으로 처리
     // 영상 분석 점수 가져오기 (오류 상황에서도)
     let cameraScores = { direction: 70, gaze: 65, smile: 75, overall: 70 } // 기본값
-    if (typeof window.getCameraAnalysisScores === 'function') {
+    if (typeof window.getCameraSessionScores === 'function') {
+      cameraScores = await window.getCameraSessionScores()
+    } else if (typeof window.getCameraAnalysisScores === 'function') {
       cameraScores = window.getCameraAnalysisScores()
     }
 
@@ -489,9 +495,13 @@ async function toggleRecording() {
 
   recordedChunks = []
   mediaRecorder = new MediaRecorder(micStream, { mimeType: 'audio/webm' })
+  sttStream = openSttStream(document.getElementById('realtimeTranscript'))
 
   mediaRecorder.ondataavailable = (e) => {
-    if (e.data && e.data.size > 0) recordedChunks.push(e.data)
+    if (e.data && e.data.size > 0) {
+      recordedChunks.push(e.data)
+      sttStream && sttStream.send(e.data)
+    }
   }
 
   mediaRecorder.onstop = async () => {
@@ -508,6 +518,16 @@ async function toggleRecording() {
     fd.append('audio', blob, 'answer.webm')
 
     const sttBox = document.getElementById('realtimeTranscript')
+
+    // 실시간 STT 결과가 있으면 업로드 없이 바로 사용
+    const streamedText = sttStream ? await sttStream.finish() : null
+    sttStream = null
+    if (streamedText) {
+      if (sttBox) sttBox.textContent = streamedText
+      console.log('STT 결과(실시간):', streamedText)
+      return
+    }
+
     if (sttBox) sttBox.textContent = '분석 중…'
 
     try {
@@ -518,7 +538,15 @@ async function toggleRecording() {
         throw new Error(`HTTP ${res.status}: ${res.statusText}`)
       }
 
-      const data = await res.json()
+      // 서버는 작업 id만 바로 돌려줌 → 완료될 때까지 long-poll
+      let data = await res.json()
+      while (data.job_id && (data.status === 'queued' || data.status === 'running')) {
+        const pollRes = await fetch(`/api/analyze/${data.job_id}?wait=20`)
+        if (!pollRes.ok) {
+          throw new Error(`HTTP ${pollRes.status}: ${pollRes.statusText}`)
+        }
+        data = await pollRes.json()
+      }
       console.log('STT 응답:', data)
 
       if (data.error) {
@@ -535,7 +563,7 @@ async function toggleRecording() {
     }
   }
 
-  mediaRecorder.start()
+  mediaRecorder.start(250) // 250ms 조각으로 실시간 STT에 전송
   isRecording = true
   if (btn) {
     btn.classList.remove('btn-danger')
@@ -545,6 +573,65 @@ async function toggleRecording() {
   recDot && recDot.classList.add('active')
 }
 
+/* ========= 실시간 STT (WebSocket) ========= */
+// 녹음 조각을 바로 서버로 보내고 partial/final 자막을 받아 표시
+// finish() → 최종 전체 텍스트 (실패/시간 초과 시 null → 기존 업로드 방식으로 처리)
+function openSttStream(sttBox) {
+  let ws
+  try {
+    ws = new WebSocket(
+      (location.protocol === 'https:' ? 'wss://' : 'ws://') +
+        location.host +
+        '/api/stt/ws'
+    )
+  } catch (e) {
+    console.warn('실시간 STT 연결 실패:', e)
+    return null
+  }
+
+  const pending = [] // 연결 전에 녹음된 조각 (첫 조각에 webm 헤더 포함)
+  let ended = false
+  let finalText = ''
+
+  const done = new Promise((resolve) => {
+    ws.onmessage = (event) => {
+      const msg = JSON.parse(event.data)
+      if (msg.type === 'final') {
+        if (msg.text) finalText += (finalText ? ' ' : '') + msg.text
+        if (sttBox) sttBox.textContent = finalText
+      } else if (msg.type === 'partial') {
+        if (sttBox) sttBox.textContent = (finalText + ' ' + msg.text).trim()
+      } else if (msg.type === 'done') {
+        resolve(msg.text)
+      } else if (msg.type === 'error') {
+        console.warn('실시간 STT 오류:', msg.error)
+      }
+    }
+    ws.onclose = () => resolve(null)
+    ws.onerror = () => resolve(null)
+  })
+
+  ws.onopen = () => {
+    pending.splice(0).forEach((b) => ws.send(b))
+    if (ended) ws.send('end')
+  }
+
+  return {
+    send(blob) {
+      if (ws.readyState === 1) ws.send(blob)
+      else pending.push(blob)
+    },
+    async finish(timeoutMs = 30000) {
+      ended = true
+      if (ws.readyState === 1) ws.send('end')
+      const timeout = new Promise((r) => setTimeout(() => r(null), timeoutMs))
+      const text = await Promise.race([done, timeout])
+      if (ws.readyState <= 1) ws.close()
+      return text
+    },
+  }
+}
+
 /* ========= 타이머 ========= */
 function startInterviewTimer() {
   interviewStartTime = new Date()
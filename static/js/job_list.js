@@ -50,6 +50,15 @@ async function fetchJobs(params = {}) {
   return j.ok ? j.items || [] : [];
 }
 
+// 키워드 검색: 서버 로컬 색인(제목/회사/근무지/고용형태/자소서 문항)에서 조회
+async function searchJobs(keyword, region1) {
+  const params = { q: keyword, size: 100 };
+  if (region1) params.region1 = region1;
+  const res = await fetch(`/api/jobs/search?${new URLSearchParams(params)}`);
+  const j = await res.json();
+  return j.ok ? j.items || [] : [];
+}
+
 // ===== 유틸 =====
 function esc(s) {
   return String(s || "")
@@ -149,15 +158,16 @@ function renderList(items) {
 async function filterJobs() {
   const params = {};
   const kw = (searchInput.value || "").trim();
-  if (kw) params.keyword = kw;
 
   const cityKey = cityFilter.value;
   const full =
     cityKey !== "all" ? cityFilter.selectedOptions[0]?.dataset.full : null;
   if (full) params.region1 = full; // 백엔드에서 정규화 후 workRegionNm 포함 여부로 필터
 
-  // 1) 목록
-  const items = await fetchJobs(params);
+  // 1) 목록 (검색어가 있으면 색인 검색)
+  const items = kw
+    ? await searchJobs(kw, params.region1)
+    : await fetchJobs(params);
 
   // 2) 정렬
   const sortBy = sortFilter.value;
@@ -7,6 +7,18 @@ document.addEventListener('DOMContentLoaded', function () {
   const resultCount = document.getElementById('resultCount')
   const noResults = document.getElementById('noResults')
 
+  // 페이지네이션 상태 (서버가 준 next_cursor 로 다음 페이지 요청)
+  const PAGE_SIZE = 20
+  let lastParams = null
+  let nextCursor = null
+  let loadedCount = 0
+  const moreButton = document.createElement('button')
+  moreButton.type = 'button'
+  moreButton.className = 'btn btn-outline-primary d-none mt-3'
+  moreButton.textContent = '더 보기'
+  moreButton.addEventListener('click', loadMore)
+  resultList.insertAdjacentElement('afterend', moreButton)
+
   // 검색 버튼 클릭 이벤트
   searchButton.addEventListener('click', searchResults)
 
@@ -42,12 +54,14 @@ document.addEventListener('DOMContentLoaded', function () {
       const params = new URLSearchParams()
       if (email) params.append('email', email)
       if (name) params.append('name', name)
+      params.append('limit', PAGE_SIZE)
+      lastParams = params
 
-      const response = await fetch(`/api/result_load?${params}`)
-      const data = await response.json()
+      const data = await fetchPage(params)
 
       if (data.status === 'success') {
         displayResults(data.data)
+        updateMore(data.next_cursor)
       } else {
         throw new Error(data.message || '검색 중 오류가 발생했습니다.')
       }
@@ -62,17 +76,54 @@ document.addEventListener('DOMContentLoaded', function () {
     }
   }
 
+  async function fetchPage(params) {
+    const response = await fetch(`/api/result_load?${params}`)
+    return response.json()
+  }
+
+  // 다음 페이지 불러오기
+  async function loadMore() {
+    if (!lastParams || !nextCursor) return
+    const params = new URLSearchParams(lastParams)
+    params.set('cursor', nextCursor)
+    moreButton.disabled = true
+    try {
+      const data = await fetchPage(params)
+      if (data.status !== 'success') {
+        throw new Error(data.message || '불러오기 중 오류가 발생했습니다.')
+      }
+      appendResults(data.data)
+      updateMore(data.next_cursor)
+    } catch (error) {
+      console.error('더 보기 오류:', error)
+      alert('불러오기 중 오류가 발생했습니다: ' + error.message)
+    } finally {
+      moreButton.disabled = false
+    }
+  }
+
+  function updateMore(cursor) {
+    nextCursor = cursor || null
+    moreButton.classList.toggle('d-none', !nextCursor)
+  }
+
   // 검색 결과 표시 함수
   function displayResults(results) {
     resultList.innerHTML = ''
     noResults.classList.add('d-none')
+    loadedCount = 0
 
     if (results.length === 0) {
       showNoResults()
       return
     }
 
-    resultCount.textContent = results.length
+    appendResults(results)
+  }
+
+  function appendResults(results) {
+    loadedCount += results.length
+    resultCount.textContent = loadedCount
 
     results.forEach((result) => {
       const card = createResultCard(result)
@@ -217,6 +268,8 @@ document.addEventListener('DOMContentLoaded', function () {
     resultList.innerHTML = ''
     noResults.classList.remove('d-none')
     resultCount.textContent = '0'
+    loadedCount = 0
+    updateMore(null)
   }
 
   // 검색 초기화
@@ -226,10 +279,19 @@ document.addEventListener('DOMContentLoaded', function () {
     showNoResults()
   }
 
-  // 상세 보기 (추후 구현)
-  window.viewDetail = function (resultId) {
-    // 상세 페이지로 이동하거나 모달 표시
-    console.log('결과 ID:', resultId)
-    // location.href = `/result-detail/${resultId}`;
+  // 상세 보기: 목록은 요약만 받으므로 전체 결과는 id 로 따로 조회
+  window.viewDetail = async function (resultId) {
+    try {
+      const response = await fetch(`/api/result_load/${encodeURIComponent(resultId)}`)
+      const data = await response.json()
+      if (data.status !== 'success') {
+        throw new Error(data.message || '상세 조회 중 오류가 발생했습니다.')
+      }
+      console.log('결과 상세:', data.data)
+      // location.href = `/result-detail/${resultId}`;
+    } catch (error) {
+      console.error('상세 조회 오류:', error)
+      alert('상세 조회 중 오류가 발생했습니다: ' + error.message)
+    }
   }
 })